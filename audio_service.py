@@ -6,8 +6,14 @@ from utils import run_cmd
 from config import PYDUB_AVAILABLE
 
 
-def mix_audio_with_bgm_and_cta(voice_audio_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5):
-    """Mix voice audio with background music and call-to-action audio"""
+def mix_audio_with_bgm_and_cta(voice_audio_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5, voice_is_normalized=False):
+    """
+    Mix voice audio with background music and call-to-action audio
+    
+    voice_is_normalized=True means voice_audio_path is already the output of
+    safe_load_audio (e.g. its .filename), so it is opened as-is rather than
+    normalized (and volume-boosted) a second time.
+    """
     from config import MOVIEPY_AVAILABLE
     
     if not MOVIEPY_AVAILABLE:
@@ -22,7 +28,7 @@ def mix_audio_with_bgm_and_cta(voice_audio_path, bgm_path=None, cta_path=None, b
     
     try:
         # Load voice audio
-        voice_audio = safe_load_audio(voice_audio_path)
+        voice_audio = AudioFileClip(voice_audio_path) if voice_is_normalized else safe_load_audio(voice_audio_path)
         voice_duration = voice_audio.duration
         
         audio_clips = [voice_audio]
@@ -309,6 +315,33 @@ def compress_audio(input_path, max_size_mb=0.5):
     return input_path
 
 
+def resample_for_whisper(input_path):
+    """
+    Decode audio once to the 16 kHz mono PCM that Whisper works on internally.
+    
+    Returns the path of a temporary WAV file (the caller removes it), or the
+    original path if FFmpeg fails.
+    """
+    temp_wav = tempfile.NamedTemporaryFile(delete=False, suffix='_16k.wav')
+    temp_wav.close()
+    
+    cmd = [
+        'ffmpeg', '-y', '-i', input_path,
+        '-ac', '1',
+        '-ar', '16000',
+        '-c:a', 'pcm_s16le',
+        temp_wav.name
+    ]
+    
+    result = run_cmd(cmd, check=False)
+    if result.returncode == 0 and os.path.getsize(temp_wav.name) > 0:
+        return temp_wav.name
+    
+    print(f"⚠️ 16 kHz resample failed for {input_path}, using original audio")
+    os.unlink(temp_wav.name)
+    return input_path
+
+
 def load_voiceover(path):
     """Load voiceover audio file"""
     from config import MOVIEPY_AVAILABLE
@@ -56,9 +56,15 @@ try:
     from faster_whisper import WhisperModel
     WHISPER_AVAILABLE = True
     print("✅ Faster-Whisper available")
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:
+        # Older faster-whisper releases have no batched pipeline
+        BatchedInferencePipeline = None
 except ImportError:
     WHISPER_AVAILABLE = False
     WhisperModel = None
+    BatchedInferencePipeline = None
     print("⚠️ Faster-Whisper not available, falling back to A4F API")
 
 # Optional imports with better error handling
@@ -71,6 +77,16 @@ except ImportError:
     AudioSegment = None
     print("⚠️ Pydub not available")
 
+# Fast JSON (optional) for large transcription caches
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    print("✅ orjson available")
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+    print("⚠️ orjson not available, using stdlib json")
+
 # Captacity import with multiple fallback strategies
 CAPTACITY_AVAILABLE = False
 try:
@@ -110,6 +126,22 @@ A4F_API_URL = "https://api.a4f.co/v1/audio/transcriptions"
 # Force local Whisper usage (disable A4F API fallback)
 FORCE_LOCAL_WHISPER = True
 
+# Number of audio chunks Faster-Whisper's batched pipeline encodes per forward pass
+WHISPER_BATCH_SIZE = 8
+
+# Persistent directory for downloaded CTranslate2 Whisper weights (reused across runs)
+WHISPER_MODEL_CACHE_DIR = os.path.expanduser("~/.cache/n8n_whisper")
+
+# Transcription caches: per-file JSON caches and the word-level SQLite store
+TRANSCRIPTION_CACHE_DIR = "transcription_cache"
+TRANSCRIPTION_STORE_PATH = os.path.join(TRANSCRIPTION_CACHE_DIR, "wordlevel.sqlite3")
+
+# Parallel Captacity captioning over time shards (opt-in: each worker is a fresh
+# process and every shard is re-encoded before captioning, so enable it only on
+# hosts where it has been measured to be faster than a single pass)
+CAPTION_SHARDING_ENABLED = False
+CAPTION_SHARD_MAX_WORKERS = 4
+
 # Global configuration
 SUBTITLE_SIZE_MULTIPLIER = 0.5  # Smaller font size (changed from 0.6 to 0.5 for size 15)
 
@@ -5,9 +5,9 @@ Creates subtitles that respect natural speech pauses and punctuation
 """
 
 import os
-import json
 import re
 from typing import List, Dict, Any
+from utils import read_json_file, write_json_file
 
 def detect_natural_pauses(segments: List[Dict], min_pause_duration: float = 0.3) -> List[Dict]:
     """
@@ -119,36 +119,50 @@ def create_pause_aware_subtitles(voiceover_path: str, cta_path: str = None, timi
     """
     print("🎯 Creating PAUSE-AWARE subtitles with 2-3 words per segment...")
     
-    from whisper_service import transcribe_with_whisper
+    from config import WHISPER_BATCH_SIZE
+    from whisper_service import transcribe_batch
     
     # Transcription cache
     cache_dir = "transcription_cache"
     os.makedirs(cache_dir, exist_ok=True)
     
     all_segments = []
+    use_cta = bool(cta_path and timing_info)
     
-    # Process voiceover with pause detection
-    print("🎤 Processing voiceover with pause detection...")
-    voiceover_mtime = os.path.getmtime(voiceover_path)
-    cache_key = f"{os.path.basename(voiceover_path)}_{voiceover_mtime}_pauses"
-    cache_file = os.path.join(cache_dir, f"{cache_key}.json")
+    def pause_cache_file(audio_path):
+        cache_key = f"{os.path.basename(audio_path)}_{os.stat(audio_path).st_mtime_ns}_pauses"
+        return os.path.join(cache_dir, f"{cache_key}.json")
     
-    if os.path.exists(cache_file):
-        print("⚡ Using cached pause-aware transcription...")
-        with open(cache_file, 'r') as f:
-            voiceover_result = json.load(f)
-    else:
+    voiceover_cache_file = pause_cache_file(voiceover_path)
+    cta_cache_file = pause_cache_file(cta_path) if use_cta else None
+    vo_missing = not os.path.exists(voiceover_cache_file)
+    cta_missing = use_cta and not os.path.exists(cta_cache_file)
+    
+    fresh_vo = fresh_cta = None
+    if vo_missing or cta_missing:
+        # Transcribe every cache miss in one batch on the shared model
         print("🤖 Transcribing with pause detection...")
-        voiceover_result = transcribe_with_whisper(voiceover_path)
-        
-        if voiceover_result and 'segments' in voiceover_result:
+        fresh_vo, fresh_cta = transcribe_batch(
+            [voiceover_path if vo_missing else None, cta_path if cta_missing else None],
+            batch_size=WHISPER_BATCH_SIZE,
+            vad=[True, False]  # The CTA is a short, tightly trimmed clip
+        )
+    
+    def pause_aware_result(result, cache_file):
+        if result and 'segments' in result:
             # Enhance segments with pause detection
-            enhanced_segments = detect_natural_pauses(voiceover_result['segments'])
-            voiceover_result['enhanced_segments'] = enhanced_segments
-        
-        with open(cache_file, 'w') as f:
-            json.dump(voiceover_result, f)
+            result['enhanced_segments'] = detect_natural_pauses(result['segments'])
+        write_json_file(cache_file, result)
+        return result
+    
+    # Process voiceover with pause detection
+    print("🎤 Processing voiceover with pause detection...")
+    if vo_missing:
+        voiceover_result = pause_aware_result(fresh_vo, voiceover_cache_file)
         print("💾 Pause-aware transcription cached")
+    else:
+        print("⚡ Using cached pause-aware transcription...")
+        voiceover_result = read_json_file(voiceover_cache_file)
     
     # Use enhanced segments if available
     if 'enhanced_segments' in voiceover_result:
@@ -165,27 +179,14 @@ def create_pause_aware_subtitles(voiceover_path: str, cta_path: str = None, timi
         all_segments.append(segment)
     
     # Process CTA if provided
-    if cta_path and timing_info:
+    if use_cta:
         print("📢 Processing CTA with pause detection...")
-        cta_mtime = os.path.getmtime(cta_path)
-        cta_cache_key = f"{os.path.basename(cta_path)}_{cta_mtime}_pauses"
-        cta_cache_file = os.path.join(cache_dir, f"{cta_cache_key}.json")
-        
-        if os.path.exists(cta_cache_file):
-            print("⚡ Using cached CTA pause-aware transcription...")
-            with open(cta_cache_file, 'r') as f:
-                cta_result = json.load(f)
-        else:
-            print("🤖 Transcribing CTA with pause detection...")
-            cta_result = transcribe_with_whisper(cta_path)
-            
-            if cta_result and 'segments' in cta_result:
-                enhanced_segments = detect_natural_pauses(cta_result['segments'])
-                cta_result['enhanced_segments'] = enhanced_segments
-            
-            with open(cta_cache_file, 'w') as f:
-                json.dump(cta_result, f)
+        if cta_missing:
+            cta_result = pause_aware_result(fresh_cta, cta_cache_file)
             print("💾 CTA pause-aware transcription cached")
+        else:
+            print("⚡ Using cached CTA pause-aware transcription...")
+            cta_result = read_json_file(cta_cache_file)
         
         # Use enhanced segments and adjust timing
         if 'enhanced_segments' in cta_result:
@@ -209,19 +210,27 @@ def create_pause_aware_subtitles(voiceover_path: str, cta_path: str = None, timi
     print(f"✅ Created {len(all_segments)} dynamic subtitle segments (2-3 words each)")
     return all_segments
 
-def create_enhanced_ass_subtitles_with_pauses(voiceover_path: str, cta_path: str = None) -> str:
+def build_enhanced_ass_content(voiceover_path: str, cta_path: str = None, cta_start: float = None) -> str:
     """
-    Create ASS subtitles that respect natural pauses and punctuation with 2-3 words per segment
+    Build the text of a pause-aware ASS script with 2-3 words per segment
+    
+    cta_start (the voiceover duration) can be passed in by callers that already
+    loaded the voiceover, to skip re-decoding it here.
+    
+    Returns:
+        ASS script text, or None if no segments were generated
     """
     print("🎨 Creating pause-aware ASS subtitles with 2-3 words per segment...")
     
     # Get timing info for CTA
     timing_info = {}
     if cta_path:
-        from video_service import safe_load_audio
-        voiceover_audio = safe_load_audio(voiceover_path)
-        timing_info['cta_start'] = voiceover_audio.duration
-        voiceover_audio.close()
+        if cta_start is None:
+            from video_service import safe_load_audio
+            voiceover_audio = safe_load_audio(voiceover_path)
+            cta_start = voiceover_audio.duration
+            voiceover_audio.close()
+        timing_info['cta_start'] = cta_start
     
     # Get pause-aware segments
     segments = create_pause_aware_subtitles(voiceover_path, cta_path, timing_info)
@@ -244,16 +253,16 @@ Style: CTA,Bangers,19,&H0000FFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,10
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
     
-    def format_ass_time(seconds):
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours}:{minutes:02d}:{secs:05.2f}"
+    from subtitle_service import format_ass_timestamps
     
-    for segment in segments:
-        start_time = format_ass_time(segment['start'])
-        end_time = format_ass_time(segment['end'])
-        
+    # Drop empty segments up front so no time formatting is spent on them
+    segments = [seg for seg in segments if seg['text'].strip()]
+    
+    # Format every start and end time in one vectorized call
+    segment_count = len(segments)
+    ass_times = format_ass_timestamps([seg['start'] for seg in segments] + [seg['end'] for seg in segments])
+    
+    for segment, start_time, end_time in zip(segments, ass_times[:segment_count], ass_times[segment_count:]):
         # Choose style based on type
         style = "CTA" if segment.get('type') == 'cta' else "VoiceOver"
         
@@ -267,14 +276,23 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         
         ass_content += f"Dialogue: 0,{start_time},{end_time},{style},,0,0,0,,{text}\n"
     
+    print(f"📊 Total segments: {len(segments)}")
+    return ass_content
+
+def create_enhanced_ass_subtitles_with_pauses(voiceover_path: str, cta_path: str = None, cta_start: float = None) -> str:
+    """
+    Create ASS subtitles that respect natural pauses and punctuation with 2-3 words per segment
+    """
+    ass_content = build_enhanced_ass_content(voiceover_path, cta_path, cta_start)
+    if not ass_content:
+        return None
+    
     # Save ASS file
     ass_file_path = "enhanced_pause_aware_subtitles.ass"
     with open(ass_file_path, 'w', encoding='utf-8') as f:
         f.write(ass_content)
     
     print(f"✅ Created pause-aware ASS subtitle file: {ass_file_path}")
-    print(f"📊 Total segments: {len(segments)}")
-    
     return ass_file_path
 
 if __name__ == "__main__":
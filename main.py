@@ -159,6 +159,19 @@ def run_cmd(cmd, check=True):
         print(f"Command failed: {' '.join(cmd)}\nError: {e.stderr}")
         return e
 
+def place_file(src, dst, keep_source=True):
+    """Put src's contents at dst; a src the caller discards is moved instead of copied"""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    if not keep_source:
+        # Same filesystem: a rename only touches metadata
+        try:
+            os.replace(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
 def calculate_optimal_font_size(video_width, video_height, text_length):
     """Calculate optimal font size based on video dimensions and text length"""
     base_size = min(video_width, video_height) // 25
@@ -724,7 +737,7 @@ def add_captacity_subtitles(video_with_audio_path, output_path, openai_api_key=N
     if not CAPTACITY_AVAILABLE:
         print("Captacity not available, cannot add professional subtitles")
         try:
-            shutil.copy(video_with_audio_path, output_path)
+            place_file(video_with_audio_path, output_path)
             return True
         except:
             return False
@@ -755,7 +768,7 @@ def add_captacity_subtitles(video_with_audio_path, output_path, openai_api_key=N
             return True
         else:
             print("Captacity output file is empty or missing, falling back to copy")
-            shutil.copy(video_with_audio_path, output_path)
+            place_file(video_with_audio_path, output_path)
             return True
     except Exception as e:
         print(f"Error adding Captacity subtitles: {e}")
@@ -780,7 +793,7 @@ def add_captacity_subtitles(video_with_audio_path, output_path, openai_api_key=N
             except Exception as fallback_error:
                 print(f"Captacity API fallback also failed: {fallback_error}")
         try:
-            shutil.copy(video_with_audio_path, output_path)
+            place_file(video_with_audio_path, output_path)
             return True
         except:
             return False
@@ -974,9 +987,9 @@ def mix_audio_files(audio_paths, volumes, output_path, target_duration=None):
             result = run_cmd(bgm_cmd, check=False)
             if result.returncode != 0:
                 print(f"BGM mixing failed: {result.stderr}")
-                shutil.copy(temp_voice_cta_path, output_path)
+                place_file(temp_voice_cta_path, output_path, keep_source=False)
         else:
-            shutil.copy(temp_voice_cta_path, output_path)
+            place_file(temp_voice_cta_path, output_path, keep_source=False)
         if os.path.exists(temp_voice_cta_path):
             os.unlink(temp_voice_cta_path)
         print(f"Successfully mixed audio to: {output_path}")
@@ -1,5 +1,9 @@
 import traceback
 
+# Zero-padded field strings, indexed instead of formatted for every timestamp
+_PAD2 = tuple(f"{i:02d}" for i in range(100))
+_PAD3 = tuple(f"{i:03d}" for i in range(1000))
+
 
 def create_segments_from_whisper_result(whisper_result, max_chars_per_segment=45, max_duration=5.0, max_words=3):
     """Create subtitle segments from Whisper transcription result with real timestamps"""
@@ -247,17 +251,18 @@ def create_segments_from_a4f_result(transcription_result, max_chars_per_segment=
         return []
 
 
+def _srt_time(seconds):
+    """Format seconds as an SRT HH:MM:SS,mmm timestamp"""
+    total_s, ms = divmod(int(seconds * 1000), 1000)
+    total_m, s = divmod(total_s, 60)
+    h, m = divmod(total_m, 60)
+    return f"{_PAD2[h] if h < 100 else h}:{_PAD2[m]}:{_PAD2[s]},{_PAD3[ms]}"
+
+
 def segments_to_srt(segments):
     """Convert segments to SRT format with vertical formatting for mobile videos"""
     srt_content = ""
     for i, seg in enumerate(segments, 1):
-        start_h, start_r = divmod(seg['start'], 3600)
-        start_m, start_s = divmod(start_r, 60)
-        start_ms = int((start_s % 1) * 1000)
-        
-        end_h, end_r = divmod(seg['end'], 3600)
-        end_m, end_s = divmod(end_r, 60)
-        end_ms = int((end_s % 1) * 1000)
         
         # FORCE vertical text layout - each word on its own line - CAPITALIZED
         original_text = seg['text'].strip().upper()  # Capitalize all text
@@ -267,8 +272,20 @@ def segments_to_srt(segments):
         vertical_text = '\n'.join(words)  # Each word on separate line, already capitalized
         
         srt_content += f"{i}\n"
-        srt_content += f"{int(start_h):02d}:{int(start_m):02d}:{int(start_s):02d},{start_ms:03d} --> "
-        srt_content += f"{int(end_h):02d}:{int(end_m):02d}:{int(end_s):02d},{end_ms:03d}\n"
+        srt_content += f"{_srt_time(seg['start'])} --> {_srt_time(seg['end'])}\n"
         srt_content += f"{vertical_text}\n\n"
     
     return srt_content
+
+
+def format_ass_timestamps(times):
+    """Format a sequence of second offsets as ASS h:mm:ss.cc strings in one vectorized pass"""
+    import numpy as np
+    
+    # Round once to whole centiseconds, then split with integer arithmetic only
+    centis = np.rint(np.asarray(times, dtype=np.float64) * 100).astype(np.int64)
+    hours = (centis // 360000).tolist()
+    minutes = (centis // 6000 % 60).tolist()
+    seconds = (centis // 100 % 60).tolist()
+    hundredths = (centis % 100).tolist()
+    return [f"{h}:{_PAD2[m]}:{_PAD2[s]}.{_PAD2[c]}" for h, m, s, c in zip(hours, minutes, seconds, hundredths)]
@@ -3,6 +3,9 @@ import json
 import os
 import random
 import glob
+import mmap
+from functools import lru_cache
+from config import ORJSON_AVAILABLE, orjson
 
 
 def run_cmd(cmd, check=True):
@@ -17,6 +20,29 @@ def run_cmd(cmd, check=True):
         return subprocess.CompletedProcess(cmd, 127, '', str(e))
 
 
+def read_json_file(path):
+    """Load a JSON file, parsing it straight from an mmap with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b'')  # mmap cannot map an empty file
+            # Parse straight from the page cache instead of copying into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_json_file(path, data):
+    """Write data as JSON (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
 def get_ffmpeg_font():
     """Get available font for FFmpeg with fallbacks."""
     # Updated font list with more common system fonts
@@ -138,6 +164,131 @@ def calculate_subtitle_position(video_width, video_height, text_height):
     return ('center', y_position)
 
 
+# Hardware H.264 encoders in order of preference. VAAPI is left out because it
+# needs a render device and an hwupload filter chain rather than a drop-in -c:v.
+HARDWARE_H264_ENCODERS = ['h264_nvenc', 'h264_videotoolbox']
+
+# libx264 preset -> closest NVENC preset (p1 fastest ... p7 slowest)
+NVENC_PRESETS = {'ultrafast': 'p1', 'superfast': 'p1', 'veryfast': 'p2', 'faster': 'p3', 'fast': 'p4', 'medium': 'p5'}
+
+
+@lru_cache(maxsize=1)
+def get_h264_encoder():
+    """Pick the fastest H.264 encoder that actually works here (probed once per process)"""
+    result = run_cmd(['ffmpeg', '-hide_banner', '-encoders'], check=False)
+    listed = result.stdout if result.returncode == 0 else ''
+    
+    for encoder in HARDWARE_H264_ENCODERS:
+        if encoder not in listed:
+            continue
+        # Being compiled in does not mean a usable GPU is present; try a tiny encode
+        test_cmd = [
+            'ffmpeg', '-hide_banner', '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            '-c:v', encoder, '-f', 'null', '-'
+        ]
+        if run_cmd(test_cmd, check=False).returncode == 0:
+            print(f"🚀 Using hardware H.264 encoder: {encoder}")
+            return encoder
+    
+    return 'libx264'
+
+
+def h264_encoder_args(preset='ultrafast'):
+    """FFmpeg video encoder arguments for get_h264_encoder(), mapping the libx264 preset"""
+    encoder = get_h264_encoder()
+    if encoder == 'h264_nvenc':
+        return ['-c:v', encoder, '-preset', NVENC_PRESETS.get(preset, 'p4')]
+    if encoder == 'h264_videotoolbox':
+        return ['-c:v', encoder, '-b:v', '8M']
+    return ['-c:v', 'libx264', '-preset', preset, '-threads', '0']
+
+
+@lru_cache(maxsize=32)
+def _load_subtitle_font(font_size):
+    """Load the subtitle font once per size (Bangers first, then DejaVu Sans Bold)"""
+    from PIL import ImageFont
+    from config import CUSTOM_FONT_PATH
+    
+    for candidate in (CUSTOM_FONT_PATH, "DejaVuSans-Bold.ttf"):
+        if not candidate:
+            continue
+        try:
+            return ImageFont.truetype(candidate, font_size)
+        except OSError:
+            continue
+    
+    print("⚠️ No TrueType subtitle font found, using Pillow default")
+    return ImageFont.load_default()
+
+
+def render_text_image(text, width, font_size, color='white', stroke_color='black', stroke_width=1, line_spacing=4):
+    """Rasterize word-wrapped, centered subtitle text to an RGBA array with Pillow (no ImageMagick)"""
+    import numpy as np
+    from PIL import Image, ImageDraw
+    
+    font = _load_subtitle_font(font_size)
+    measure = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    
+    # Greedy word wrap to the target width, like TextClip's caption method
+    max_line_width = width - 2 * stroke_width
+    lines = []
+    current_line = ""
+    for word in text.split():
+        candidate = f"{current_line} {word}" if current_line else word
+        if current_line and measure.textlength(candidate, font=font) > max_line_width:
+            lines.append(current_line)
+            current_line = word
+        else:
+            current_line = candidate
+    if current_line:
+        lines.append(current_line)
+    wrapped_text = "\n".join(lines)
+    
+    left, top, right, bottom = measure.multiline_textbbox(
+        (width // 2, 0), wrapped_text, font=font, anchor='ma',
+        spacing=line_spacing, align='center', stroke_width=stroke_width
+    )
+    
+    img = Image.new('RGBA', (width, max(bottom - top, 1)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.multiline_text(
+        (width // 2, -top), wrapped_text, font=font, anchor='ma',
+        spacing=line_spacing, align='center', fill=color,
+        stroke_width=stroke_width, stroke_fill=stroke_color
+    )
+    return np.array(img)
+
+
+def _select_clip_files(folder, clip_duration, total_duration):
+    """
+    Shuffle the video files in folder and pick enough of them to cover total_duration.
+    
+    Files are repeated when the folder has fewer than needed. Returns the
+    list of selected file names (one per clip slot), or [] if there are none.
+    """
+    # Get all video files in the folder (.mp4, .mov, .avi, .mkv)
+    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.m4v']
+    clip_files = [f for f in os.listdir(folder) 
+                  if any(f.lower().endswith(ext) for ext in video_extensions)]
+    
+    if not clip_files:
+        print(f"❌ No video files found in {folder}")
+        return []
+    
+    print(f"📁 Found {len(clip_files)} video files in clips folder")
+    
+    # Shuffle the files for randomness
+    random.shuffle(clip_files)
+    
+    # Calculate how many clips we need
+    clips_needed = int(total_duration / clip_duration) + 1  # +1 to ensure we have enough
+    
+    print(f"🎲 Selecting {clips_needed} random clips for {total_duration}s duration")
+    
+    selected_files = clip_files[:clips_needed] if len(clip_files) >= clips_needed else clip_files * (clips_needed // len(clip_files) + 1)
+    return selected_files[:clips_needed]
+
+
 def get_random_clips(folder, clip_duration, total_duration):
     """
     Get random video clips from a folder to cover the specified duration.
@@ -163,29 +314,13 @@ def get_random_clips(folder, clip_duration, total_duration):
         print("❌ Could not import VideoFileClip from moviepy")
         return []
     
-    # Get all video files in the folder (.mp4, .mov, .avi, .mkv)
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.m4v']
-    clip_files = [f for f in os.listdir(folder) 
-                  if any(f.lower().endswith(ext) for ext in video_extensions)]
-    
-    if not clip_files:
-        print(f"❌ No video files found in {folder}")
+    selected_files = _select_clip_files(folder, clip_duration, total_duration)
+    if not selected_files:
         return []
-    
-    print(f"📁 Found {len(clip_files)} video files in clips folder")
-    
-    # Shuffle the files for randomness
-    random.shuffle(clip_files)
-    
-    # Calculate how many clips we need
-    clips_needed = int(total_duration / clip_duration) + 1  # +1 to ensure we have enough
-    
-    print(f"🎲 Selecting {clips_needed} random clips for {total_duration}s duration")
+    clips_needed = len(selected_files)
     
     video_clips = []
-    selected_files = clip_files[:clips_needed] if len(clip_files) >= clips_needed else clip_files * (clips_needed // len(clip_files) + 1)
-    
-    for i, filename in enumerate(selected_files[:clips_needed]):
+    for i, filename in enumerate(selected_files):
         try:
             file_path = os.path.join(folder, filename)
             print(f"   Loading clip {i+1}/{clips_needed}: {filename}")
@@ -279,6 +414,106 @@ def get_random_clips(folder, clip_duration, total_duration):
     return video_clips[:clips_needed]
 
 
+def probe_media_duration(path):
+    """Return the container duration of a media file via ffprobe, or None"""
+    probe_cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        path
+    ]
+    result = run_cmd(probe_cmd, check=False)
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def probe_video_format(path):
+    """
+    Return (duration, format) for a video file via one ffprobe call.
+    
+    format is a (codec_name, width, height, pix_fmt, r_frame_rate) tuple for
+    the first video stream; clips can only be concatenated directly when
+    these all match. Returns (None, None) if the file cannot be probed.
+    """
+    probe_cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'format=duration:stream=codec_name,width,height,pix_fmt,r_frame_rate',
+        '-of', 'json',
+        path
+    ]
+    result = run_cmd(probe_cmd, check=False)
+    if result.returncode != 0:
+        return None, None
+    try:
+        info = json.loads(result.stdout)
+        stream = info['streams'][0]
+        stream_format = tuple(stream.get(key) for key in ('codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate'))
+        return float(info['format']['duration']), stream_format
+    except (ValueError, KeyError, IndexError):
+        return None, None
+
+
+def get_random_clip_specs(folder, clip_duration, total_duration):
+    """
+    Pick random clip windows like get_random_clips, but without decoding anything.
+    
+    Durations are read with ffprobe and each selection is returned as a
+    dict with 'path', 'start' and 'end' so it can be fed to the ffmpeg
+    concat demuxer as inpoint/outpoint directives. 'format' holds the clip's
+    video stream parameters (see probe_video_format).
+    
+    Args:
+        folder (str): Path to folder containing video clips
+        clip_duration (float): Duration of each clip in seconds
+        total_duration (float): Total duration to cover
+    
+    Returns:
+        list: List of clip spec dicts, or None if nothing usable was found
+    """
+    selected_files = _select_clip_files(folder, clip_duration, total_duration)
+    if not selected_files:
+        return None
+    clips_needed = len(selected_files)
+    
+    clip_specs = []
+    for filename in selected_files:
+        file_path = os.path.abspath(os.path.join(folder, filename))
+        clip_full_duration, stream_format = probe_video_format(file_path)
+        if not clip_full_duration or clip_full_duration <= 0:
+            print(f"   ⚠️ Clip {filename} invalid duration, skipping")
+            continue
+        
+        # Same safety buffer as get_random_clips to stay clear of the file end
+        safe_duration = max(0.5, clip_full_duration - 0.3)
+        actual_clip_duration = min(clip_duration, safe_duration)
+        if actual_clip_duration <= 0.5:
+            print(f"   ⚠️ Clip {filename} too short ({clip_full_duration:.2f}s), skipping")
+            continue
+        
+        start_time = random.uniform(0, safe_duration - clip_duration) if safe_duration > clip_duration else 0.0
+        clip_specs.append({
+            'path': file_path,
+            'start': start_time,
+            'end': start_time + actual_clip_duration,
+            'format': stream_format
+        })
+    
+    if not clip_specs:
+        print("❌ No valid video clips found!")
+        return None
+    
+    while len(clip_specs) < clips_needed:
+        clip_specs.extend(clip_specs[:clips_needed - len(clip_specs)])
+    
+    print(f"✅ Selected {len(clip_specs)} clip windows for {total_duration:.2f}s")
+    return clip_specs[:clips_needed]
+
+
 def apply_transitions(video_clips, transition_type="crossfade", transition_duration=0.5):
     """
     Apply transitions between video clips for smooth clip changes
@@ -1,12 +1,30 @@
 import os
 import uuid
+import hashlib
 import json
 import tempfile
+import threading
 import traceback
-from config import MOVIEPY_AVAILABLE, SUBTITLE_SIZE_MULTIPLIER, CLIPS_FOLDER, CLIP_DURATION, CUSTOM_FONT_PATH, SUBTITLE_FONT_SIZE
+from concurrent.futures import ThreadPoolExecutor
+from config import ORJSON_AVAILABLE, orjson, MOVIEPY_AVAILABLE, SUBTITLE_SIZE_MULTIPLIER, WHISPER_BATCH_SIZE, CLIPS_FOLDER, CLIP_DURATION, CUSTOM_FONT_PATH, SUBTITLE_FONT_SIZE
 from audio_service import safe_load_audio, mix_audio_with_bgm_and_cta, transcribe_cta_audio, load_voiceover, load_bgm, load_cta, merge_audio
-from utils import run_cmd, get_available_font, calculate_optimal_font_size, get_ffmpeg_font, get_random_clips
-from subtitle_service import segments_to_srt
+from utils import run_cmd, calculate_optimal_font_size, render_text_image, h264_encoder_args, get_ffmpeg_font, get_random_clips, get_random_clip_specs
+from subtitle_service import segments_to_srt, format_ass_timestamps
+
+
+# Static header for the ASS script burned in by create_video_with_ffmpeg_subtitles.
+# Voiceover is white, CTA is yellow; both small (19px) and TRUE CENTER (alignment=5 = middle center)
+FFMPEG_ASS_HEADER = (
+    "[Script Info]\n"
+    "Title: Video Subtitles\n"
+    "ScriptType: v4.00+\n\n"
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    "Style: Voiceover,Bangers,19,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,1,2,0,5,0,0,0,1\n"
+    "Style: CTA,Bangers,19,&H0000FFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,1,2,0,5,0,0,0,1\n\n"
+    "[Events]\n"
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+)
 
 
 def safe_load_video(path):
@@ -72,7 +90,8 @@ def create_video_with_subtitles_moviepy(video_path, audio_path, subtitle_segment
     if not MOVIEPY_AVAILABLE:
         raise Exception("MoviePy not available")
     
-    from moviepy.editor import TextClip, CompositeVideoClip, concatenate_audioclips, concatenate_videoclips
+    from moviepy.editor import ImageClip, CompositeVideoClip, concatenate_audioclips
+    from moviepy.video.fx.loop import loop
     
     try:
         print("📂 Loading video and audio files...")
@@ -112,9 +131,7 @@ def create_video_with_subtitles_moviepy(video_path, audio_path, subtitle_segment
         # If audio is longer than video (e.g., voice + CTA), extend video by looping
         if audio_duration > video_duration:
             print(f"🔄 Extending video to match audio duration ({audio_duration:.2f}s)")
-            loops_needed = int(audio_duration / video_duration) + 1
-            video_clips = [video] * loops_needed
-            video = concatenate_videoclips(video_clips).subclip(0, audio_duration)
+            video = loop(video, duration=audio_duration)
         elif audio_duration < video_duration:
             print("✂️ Trimming video to match audio duration")
             video = video.subclip(0, audio_duration)
@@ -143,7 +160,6 @@ def create_video_with_subtitles_moviepy(video_path, audio_path, subtitle_segment
         if subtitle_segments:
             print(f"📝 Creating {len(subtitle_segments)} subtitle clips...")
             subtitle_clips = []
-            font_choice = get_available_font()
             
             for i, seg in enumerate(subtitle_segments):
                 try:
@@ -175,18 +191,15 @@ def create_video_with_subtitles_moviepy(video_path, audio_path, subtitle_segment
                     max_subtitle_height = int(video_height * 0.15)  # 15% of height for visibility
                     print(f"🔄 Using CAPITALIZED horizontal layout: '{text}' -> '{horizontal_text}'")
                     
-                    txt_clip = TextClip(
+                    txt_clip = ImageClip(render_text_image(
                         horizontal_text,
-                        font=font_choice,
-                        fontsize=font_size,
+                        max_subtitle_width,
+                        font_size,
                         color='white',
                         stroke_color='black',
                         stroke_width=1,  # Thinner stroke for smaller text
-                        size=(max_subtitle_width, max_subtitle_height),
-                        method='caption',
-                        align='center',  # Center each line
-                        interline=-8    # Tighter line spacing for compact vertical layout
-                    )
+                        line_spacing=0  # Tighter line spacing for compact vertical layout
+                    ))
                     
                     # Ensure subtitle clip fits within video bounds
                     actual_width = min(txt_clip.w, max_subtitle_width)
@@ -598,10 +611,81 @@ def create_video_with_random_clips(voiceover_path, bgm_path, output_path, cta_pa
         return None
 
 
+def create_video_with_concat_demuxer(clip_specs, audio_path, duration, output_path):
+    """
+    Assemble clip windows with the FFmpeg concat demuxer and mux the final audio.
+    
+    The windows are cut frame-accurately and encoded once, in a single ffmpeg
+    process, to 24 fps H.264 (a stream copy could only start each window on a
+    keyframe). Only clips sharing codec, resolution, pixel format and frame
+    rate are joined this way; returns False otherwise so the caller can fall
+    back to MoviePy.
+    """
+    # The concat demuxer presents all files as one stream, so they must agree
+    clip_formats = {spec['format'] for spec in clip_specs}
+    if len(clip_formats) != 1:
+        print(f"⚠️ Clips differ in format ({len(clip_formats)} variants), cannot concatenate them directly")
+        return False
+    
+    list_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt', encoding='utf-8')
+    concat_path = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4').name
+    try:
+        for spec in clip_specs:
+            escaped_path = spec['path'].replace("'", "'\\''")
+            list_file.write(f"file '{escaped_path}'\n")
+            list_file.write(f"inpoint {spec['start']:.3f}\n")
+            list_file.write(f"outpoint {spec['end']:.3f}\n")
+        list_file.close()
+        
+        print(f"🔗 Concatenating {len(clip_specs)} clips with FFmpeg concat demuxer...")
+        concat_cmd = [
+            'ffmpeg', '-y',
+            '-f', 'concat', '-safe', '0',
+            '-i', list_file.name,
+            '-an',
+            '-r', '24',
+            '-pix_fmt', 'yuv420p',
+            *h264_encoder_args('ultrafast'),
+            concat_path
+        ]
+        result = run_cmd(concat_cmd, check=False)
+        if result.returncode != 0:
+            print(f"⚠️ Concat demuxer failed: {result.stderr[-500:]}")
+            return False
+        
+        # Loop the concatenated video if it is shorter than the audio, then cut to length
+        mux_cmd = [
+            'ffmpeg', '-y',
+            '-stream_loop', '-1', '-i', concat_path,
+            '-i', audio_path,
+            '-map', '0:v:0',
+            '-map', '1:a:0',
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            '-b:a', '128k',
+            '-t', f"{duration:.3f}",
+            output_path
+        ]
+        result = run_cmd(mux_cmd, check=False)
+        if result.returncode != 0:
+            print(f"⚠️ Audio mux failed: {result.stderr[-500:]}")
+            return False
+        
+        return os.path.exists(output_path)
+    finally:
+        for temp_file in (list_file.name, concat_path):
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+
+
 def create_video_with_random_clips_fixed(voiceover_path, output_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5):
     """
     Create video with random clips using the proven direct MoviePy approach.
     This function replaces the problematic create_video_with_random_clips function.
+    Clips are first joined in one ffmpeg pass with the concat demuxer; MoviePy
+    is only used when the clips cannot be concatenated that way.
     """
     try:
         print("🎬 Creating video with random clips (FIXED APPROACH)...")
@@ -611,6 +695,32 @@ def create_video_with_random_clips_fixed(voiceover_path, output_path, bgm_path=N
         voiceover_duration = voiceover.duration
         print(f"🎤 Voiceover duration: {voiceover_duration:.2f}s")
         
+        # Handle audio mixing
+        if bgm_path or cta_path:
+            print("🎵 Mixing audio with BGM/CTA...")
+            mixed_audio_path, final_duration, timing_info = mix_audio_with_bgm_and_cta(
+                voiceover_path, bgm_path, cta_path, bgm_volume, cta_volume
+            )
+            final_audio_path = mixed_audio_path
+            print(f"🎵 Mixed audio duration: {final_duration:.2f}s")
+        else:
+            final_audio_path = voiceover_path
+            final_duration = voiceover_duration
+        
+        audio = safe_load_audio(final_audio_path) if bgm_path or cta_path else voiceover
+        
+        # FAST PATH: cut and join the selected clip windows in one ffmpeg pass with the concat demuxer.
+        # Mux the normalized file safe_load_audio produced, like the MoviePy path does
+        clip_specs = get_random_clip_specs(CLIPS_FOLDER, CLIP_DURATION, voiceover_duration)
+        if clip_specs and create_video_with_concat_demuxer(clip_specs, audio.filename, final_duration, output_path):
+            audio.close()
+            if bgm_path or cta_path:
+                voiceover.close()
+            print(f"✅ Video created successfully: {output_path}")
+            return output_path
+        
+        print("🔄 Concat demuxer unavailable for these clips, assembling with MoviePy...")
+        
         # Get random clips (returns VideoFileClip objects)
         print(f"🎞️ Getting random clips from {CLIPS_FOLDER}...")
         video_clips = get_random_clips(CLIPS_FOLDER, CLIP_DURATION, voiceover_duration)
@@ -641,27 +751,15 @@ def create_video_with_random_clips_fixed(voiceover_path, output_path, bgm_path=N
             raise Exception("MoviePy not available")
         
         from moviepy.editor import concatenate_videoclips
+        from moviepy.video.fx.loop import loop
         video_clip = concatenate_videoclips(processed_clips)
         print(f"📹 Total video duration: {video_clip.duration:.2f}s")
         
-        # Handle audio mixing
-        if bgm_path or cta_path:
-            print("🎵 Mixing audio with BGM/CTA...")
-            mixed_audio_path, final_duration, timing_info = mix_audio_with_bgm_and_cta(
-                voiceover_path, bgm_path, cta_path, bgm_volume, cta_volume
-            )
-            audio = safe_load_audio(mixed_audio_path)
-            print(f"🎵 Mixed audio duration: {final_duration:.2f}s")
-        else:
-            audio = voiceover
-            final_duration = voiceover_duration
-        
         # Extend video to match audio duration if needed
         if video_clip.duration < final_duration:
             print(f"🔄 Extending video to match audio duration ({final_duration:.2f}s)")
-            loops_needed = int(final_duration / video_clip.duration) + 1
-            video_clips_extended = [video_clip] * loops_needed
-            video_clip = concatenate_videoclips(video_clips_extended).subclip(0, final_duration)
+            # Lazy loop over the single source reader instead of concatenating copies
+            video_clip = loop(video_clip, duration=final_duration)
         elif video_clip.duration > final_duration:
             video_clip = video_clip.subclip(0, final_duration)
         
@@ -701,11 +799,23 @@ def create_video_with_random_clips_fixed(voiceover_path, output_path, bgm_path=N
         return None
 
 
+def _drain_background_jobs(executor, *futures):
+    """Cancel queued background jobs, wait for running ones and report any that failed"""
+    if executor is None:
+        return
+    executor.shutdown(wait=True, cancel_futures=True)
+    for future in futures:
+        if future is not None and not future.cancelled() and future.exception() is not None:
+            print(f"⚠️ Background job failed: {future.exception()}")
+
+
 def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5):
     """
     Create video with random clips, audio mixing, and dynamic subtitles for voiceover and CTA.
     Subtitles are timed so CTA subtitles start exactly when voiceover ends.
     """
+    executor = None
+    mix_future = transcription_future = None
     try:
         print("🎬 Creating video with random clips and DYNAMIC SUBTITLES...")
         
@@ -713,14 +823,27 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         if not MOVIEPY_AVAILABLE:
             raise Exception("MoviePy not available")
         
-        from moviepy.editor import concatenate_videoclips, CompositeVideoClip, TextClip
-        from whisper_service import transcribe_with_whisper
+        from moviepy.editor import concatenate_videoclips, CompositeVideoClip, ImageClip
+        from moviepy.video.fx.loop import loop
+        from whisper_service import transcribe_batch
         
         # Load voiceover to get duration
         voiceover = safe_load_audio(voiceover_path)
         voiceover_duration = voiceover.duration
         print(f"🎤 Voiceover duration: {voiceover_duration:.2f}s")
         
+        # Audio mixing and transcription only depend on the input audio, so run
+        # them in the background while the clips are loaded and concatenated
+        # (the mix reuses the voiceover normalized above instead of rewriting
+        # the same _normalized.wav while this thread still reads it)
+        executor = ThreadPoolExecutor(max_workers=3)
+        if bgm_path or cta_path:
+            mix_future = executor.submit(
+                mix_audio_with_bgm_and_cta, voiceover.filename, bgm_path, cta_path, bgm_volume, cta_volume,
+                voice_is_normalized=True
+            )
+        transcription_future = executor.submit(transcribe_batch, [voiceover_path, cta_path], vad=[True, False])
+        
         # Get random clips (returns VideoFileClip objects)
         print(f"🎞️ Getting random clips from {CLIPS_FOLDER}...")
         video_clips = get_random_clips(CLIPS_FOLDER, CLIP_DURATION, voiceover_duration)
@@ -753,11 +876,9 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         # Handle audio mixing and get timing info
         timing_info = {'voiceover_duration': voiceover_duration, 'cta_start': voiceover_duration, 'cta_duration': 0}
         
-        if bgm_path or cta_path:
+        if mix_future:
             print("🎵 Mixing audio with BGM/CTA...")
-            mixed_audio_path, final_duration, timing_info = mix_audio_with_bgm_and_cta(
-                voiceover_path, bgm_path, cta_path, bgm_volume, cta_volume
-            )
+            mixed_audio_path, final_duration, timing_info = mix_future.result()
             audio = safe_load_audio(mixed_audio_path)
             print(f"🎵 Mixed audio duration: {final_duration:.2f}s")
             
@@ -775,22 +896,20 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         # Extend video to match audio duration if needed
         if video_clip.duration < final_duration:
             print(f"🔄 Extending video to match audio duration ({final_duration:.2f}s)")
-            loops_needed = int(final_duration / video_clip.duration) + 1
-            video_clips_extended = [video_clip] * loops_needed
-            video_clip = concatenate_videoclips(video_clips_extended).subclip(0, final_duration)
+            # Lazy loop over the single source reader instead of concatenating copies
+            video_clip = loop(video_clip, duration=final_duration)
         elif video_clip.duration > final_duration:
             video_clip = video_clip.subclip(0, final_duration)
         
         # Generate subtitles for voiceover
         print("📝 Generating subtitles for voiceover...")
-        voiceover_result = transcribe_with_whisper(voiceover_path)
+        voiceover_result, cta_result = transcription_future.result()
         voiceover_segments = voiceover_result['segments'] if voiceover_result and 'segments' in voiceover_result else []
         
         # Generate subtitles for CTA if present
         cta_segments = []
         if cta_path and timing_info['cta_duration'] > 0:
             print("📝 Generating subtitles for CTA...")
-            cta_result = transcribe_with_whisper(cta_path)
             cta_segments = cta_result['segments'] if cta_result and 'segments' in cta_result else []
             if cta_segments:
                 # Adjust CTA segment timings to start after voiceover
@@ -804,12 +923,19 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         video_width = video_clip.w
         video_height = video_clip.h
         
+        # Layout is invariant for the whole render, so compute it once
+        vo_font_size = max(int(video_height * 0.06), 24)  # Dynamic font size
+        cta_font_size = max(int(video_height * 0.07), 26)  # Slightly larger for CTA
+        margin_bottom = int(video_height * 0.1)
+        text_width = int(video_width * 0.9)
+        
         # Add voiceover subtitles
         if voiceover_segments:
             print(f"🎬 Creating {len(voiceover_segments)} voiceover subtitle clips...")
+            vo_texts = [segment['text'].strip().upper() for segment in voiceover_segments]
             for i, segment in enumerate(voiceover_segments):
                 try:
-                    text = segment['text'].strip()
+                    text = vo_texts[i]
                     if not text:
                         continue
                     
@@ -818,20 +944,16 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
                     duration = end_time - start_time
                     
                     # Create text clip for voiceover (white text with black outline)
-                    font_size = max(int(video_height * 0.06), 24)  # Dynamic font size
-                    txt_clip = TextClip(
-                        text.upper(),
-                        fontsize=font_size,
+                    txt_clip = ImageClip(render_text_image(
+                        text,
+                        text_width,
+                        vo_font_size,
                         color='white',
                         stroke_color='black',
-                        stroke_width=2,
-                        size=(int(video_width * 0.9), None),
-                        method='caption',
-                        align='center'
-                    )
+                        stroke_width=2
+                    ))
                     
                     # Position at bottom of screen
-                    margin_bottom = int(video_height * 0.1)
                     x_pos = (video_width - txt_clip.w) // 2
                     y_pos = video_height - txt_clip.h - margin_bottom
                     
@@ -847,9 +969,10 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         # Add CTA subtitles
         if cta_segments:
             print(f"🎬 Creating {len(cta_segments)} CTA subtitle clips...")
+            cta_texts = [segment['text'].strip().upper() for segment in cta_segments]
             for i, segment in enumerate(cta_segments):
                 try:
-                    text = segment['text'].strip()
+                    text = cta_texts[i]
                     if not text:
                         continue
                     
@@ -858,20 +981,16 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
                     duration = end_time - start_time
                     
                     # Create text clip for CTA (yellow text with black outline for distinction)
-                    font_size = max(int(video_height * 0.07), 26)  # Slightly larger for CTA
-                    txt_clip = TextClip(
-                        text.upper(),
-                        fontsize=font_size,
+                    txt_clip = ImageClip(render_text_image(
+                        text,
+                        text_width,
+                        cta_font_size,
                         color='yellow',
                         stroke_color='black',
-                        stroke_width=3,
-                        size=(int(video_width * 0.9), None),
-                        method='caption',
-                        align='center'
-                    )
+                        stroke_width=3
+                    ))
                     
                     # Position at bottom of screen (same as voiceover)
-                    margin_bottom = int(video_height * 0.1)
                     x_pos = (video_width - txt_clip.w) // 2
                     y_pos = video_height - txt_clip.h - margin_bottom
                     
@@ -929,6 +1048,10 @@ def create_video_with_random_clips_and_subtitles(voiceover_path, output_path, bg
         print(f"❌ Error creating video with subtitles: {e}")
         traceback.print_exc()
         return None
+    
+    finally:
+        # Never leave the mix/transcription jobs running past this function
+        _drain_background_jobs(executor, mix_future, transcription_future)
 
 
 def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, output_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5):
@@ -940,6 +1063,8 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
     - Simplified text rendering
     - Faster video writing settings
     """
+    executor = None
+    mix_future = transcription_future = None
     try:
         print("🎬 Creating video with random clips and OPTIMIZED SUBTITLES...")
         
@@ -947,14 +1072,27 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         if not MOVIEPY_AVAILABLE:
             raise Exception("MoviePy not available")
         
-        from moviepy.editor import concatenate_videoclips, CompositeVideoClip, TextClip
-        from whisper_service import transcribe_with_whisper
+        from moviepy.editor import concatenate_videoclips, CompositeVideoClip, ImageClip
+        from moviepy.video.fx.loop import loop
+        from whisper_service import transcribe_batch
         
         # Load voiceover to get duration
         voiceover = safe_load_audio(voiceover_path)
         voiceover_duration = voiceover.duration
         print(f"🎤 Voiceover duration: {voiceover_duration:.2f}s")
         
+        # Audio mixing and transcription only depend on the input audio, so run
+        # them in the background while the clips are loaded and concatenated
+        # (the mix reuses the voiceover normalized above instead of rewriting
+        # the same _normalized.wav while this thread still reads it)
+        executor = ThreadPoolExecutor(max_workers=3)
+        if bgm_path or cta_path:
+            mix_future = executor.submit(
+                mix_audio_with_bgm_and_cta, voiceover.filename, bgm_path, cta_path, bgm_volume, cta_volume,
+                voice_is_normalized=True
+            )
+        transcription_future = executor.submit(transcribe_batch, [voiceover_path, cta_path], vad=[True, False])
+        
         # Get random clips (returns VideoFileClip objects)
         print(f"🎞️ Getting random clips from {CLIPS_FOLDER}...")
         video_clips = get_random_clips(CLIPS_FOLDER, CLIP_DURATION, voiceover_duration)
@@ -987,11 +1125,9 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         # Handle audio mixing and get timing info
         timing_info = {'voiceover_duration': voiceover_duration, 'cta_start': voiceover_duration, 'cta_duration': 0}
         
-        if bgm_path or cta_path:
+        if mix_future:
             print("🎵 Mixing audio with BGM/CTA...")
-            mixed_audio_path, final_duration, timing_info = mix_audio_with_bgm_and_cta(
-                voiceover_path, bgm_path, cta_path, bgm_volume, cta_volume
-            )
+            mixed_audio_path, final_duration, timing_info = mix_future.result()
             audio = safe_load_audio(mixed_audio_path)
             print(f"🎵 Mixed audio duration: {final_duration:.2f}s")
             
@@ -1009,9 +1145,8 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         # Extend video to match audio duration if needed
         if video_clip.duration < final_duration:
             print(f"🔄 Extending video to match audio duration ({final_duration:.2f}s)")
-            loops_needed = int(final_duration / video_clip.duration) + 1
-            video_clips_extended = [video_clip] * loops_needed
-            video_clip = concatenate_videoclips(video_clips_extended).subclip(0, final_duration)
+            # Lazy loop over the single source reader instead of concatenating copies
+            video_clip = loop(video_clip, duration=final_duration)
         elif video_clip.duration > final_duration:
             video_clip = video_clip.subclip(0, final_duration)
         
@@ -1021,7 +1156,7 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         
         # Generate subtitles for voiceover
         print("📝 Generating subtitles for voiceover...")
-        voiceover_result = transcribe_with_whisper(voiceover_path)
+        voiceover_result, cta_result = transcription_future.result()
         voiceover_segments = voiceover_result['segments'] if voiceover_result and 'segments' in voiceover_result else []
         
         # OPTIMIZATION: Merge nearby segments to reduce subtitle clip count
@@ -1057,7 +1192,6 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         cta_segments = []
         if cta_path and timing_info['cta_duration'] > 0:
             print("📝 Generating subtitles for CTA...")
-            cta_result = transcribe_with_whisper(cta_path)
             cta_segments = cta_result['segments'] if cta_result and 'segments' in cta_result else []
             if cta_segments:
                 # Adjust CTA segment timings to start after voiceover
@@ -1078,13 +1212,18 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         
         # OPTIMIZATION: Use smaller font and simpler styling for faster rendering
         base_font_size = max(int(video_height * 0.04), 18)  # Smaller font
+        cta_font_size = base_font_size + 2  # Slightly larger for CTA
+        margin_bottom = int(video_height * 0.08)  # Fixed positioning
+        text_width = int(video_width * 0.9)
         
         # Add voiceover subtitles
         if voiceover_segments:
             print(f"🎬 Creating {len(voiceover_segments)} optimized voiceover subtitle clips...")
+            # OPTIMIZATION: Normalize and limit all texts in one pass
+            vo_texts = [segment['text'].strip().upper()[:100] for segment in voiceover_segments]
             for i, segment in enumerate(voiceover_segments):
                 try:
-                    text = segment['text'].strip()
+                    text = vo_texts[i]
                     if not text:
                         continue
                     
@@ -1093,18 +1232,15 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
                     duration = end_time - start_time
                     
                     # OPTIMIZATION: Simpler text clip creation
-                    txt_clip = TextClip(
-                        text.upper()[:100],  # Limit text length
-                        fontsize=base_font_size,
+                    txt_clip = ImageClip(render_text_image(
+                        text,
+                        text_width,
+                        base_font_size,
                         color='white',
                         stroke_color='black',
-                        stroke_width=1,  # Thinner stroke
-                        method='caption',
-                        align='center'
-                    )
+                        stroke_width=1  # Thinner stroke
+                    ))
                     
-                    # OPTIMIZATION: Fixed positioning to avoid calculations
-                    margin_bottom = int(video_height * 0.08)
                     x_pos = (video_width - txt_clip.w) // 2
                     y_pos = video_height - txt_clip.h - margin_bottom
                     
@@ -1120,9 +1256,10 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         # Add CTA subtitles
         if cta_segments:
             print(f"🎬 Creating {len(cta_segments)} optimized CTA subtitle clips...")
+            cta_texts = [segment['text'].strip().upper()[:100] for segment in cta_segments]
             for i, segment in enumerate(cta_segments):
                 try:
-                    text = segment['text'].strip()
+                    text = cta_texts[i]
                     if not text:
                         continue
                     
@@ -1131,17 +1268,15 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
                     duration = end_time - start_time
                     
                     # OPTIMIZATION: Simpler CTA text clip
-                    txt_clip = TextClip(
-                        text.upper()[:100],  # Limit text length
-                        fontsize=base_font_size + 2,  # Slightly larger for CTA
+                    txt_clip = ImageClip(render_text_image(
+                        text,
+                        text_width,
+                        cta_font_size,
                         color='yellow',
                         stroke_color='black',
-                        stroke_width=1,
-                        method='caption',
-                        align='center'
-                    )
+                        stroke_width=1
+                    ))
                     
-                    margin_bottom = int(video_height * 0.08)
                     x_pos = (video_width - txt_clip.w) // 2
                     y_pos = video_height - txt_clip.h - margin_bottom
                     
@@ -1200,17 +1335,171 @@ def create_video_with_random_clips_and_subtitles_optimized(voiceover_path, outpu
         print(f"❌ Error creating optimized video with subtitles: {e}")
         traceback.print_exc()
         return None
+    
+    finally:
+        # Never leave the mix/transcription jobs running past this function
+        _drain_background_jobs(executor, mix_future, transcription_future)
+
+
+def _write_to_pipe(fd, data):
+    """Write data to a pipe fd and close it, tolerating a reader that went away"""
+    try:
+        with os.fdopen(fd, 'wb', buffering=1 << 20) as pipe:
+            pipe.write(data)
+    except BrokenPipeError:
+        pass
+
+
+def burn_subtitles_from_frames(video_clip, audio_path, ass_text, output_path, fps=24, preset='ultrafast'):
+    """
+    Encode a MoviePy clip and burn ASS subtitles in a single FFmpeg pass.
+    
+    Frames are piped to FFmpeg as raw RGB on stdin and the subtitles filter runs
+    in the same filtergraph, so no intermediate video is written or re-decoded.
+    The ASS script itself is fed through an inherited pipe (/dev/fd/N), so it
+    never touches disk either.
+    A hardware H.264 encoder is used when one is available; preset is the
+    libx264 preset and is mapped onto it.
+    
+    Returns:
+        tuple: (success, stderr_text)
+    """
+    import subprocess
+    
+    width, height = video_clip.size
+    
+    # The ass filter's libass reader needs a seekable file; the subtitles
+    # filter demuxes through libavformat and reads a pipe fine
+    sub_read_fd, sub_write_fd = os.pipe()
+    ffmpeg_cmd = [
+        'ffmpeg', '-y',
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-s', f'{width}x{height}',
+        '-r', str(fps),
+        '-i', '-',
+        '-i', audio_path,
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-vf', f"subtitles=/dev/fd/{sub_read_fd}",
+        *h264_encoder_args(preset),
+        '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac',
+        '-shortest',
+        output_path
+    ]
+    
+    import numpy as np
+    
+    # stderr goes to a file: a full stderr pipe would block FFmpeg while we
+    # are blocked writing frames to its stdin
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            proc = subprocess.Popen(
+                ffmpeg_cmd, stdin=subprocess.PIPE, stderr=stderr_file, pass_fds=(sub_read_fd,)
+            )
+        except Exception:
+            os.close(sub_write_fd)
+            raise
+        finally:
+            # Only FFmpeg holds the read end now, so the writer sees EPIPE if it exits
+            os.close(sub_read_fd)
+        
+        sub_writer = threading.Thread(
+            target=_write_to_pipe, args=(sub_write_fd, ass_text.encode('utf-8')), daemon=True
+        )
+        sub_writer.start()
+        try:
+            for frame in video_clip.iter_frames(fps=fps, dtype='uint8'):
+                # Hand the frame's own buffer to the pipe; frames larger than the
+                # writer's buffer are passed straight through without a copy
+                proc.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            pass  # FFmpeg exited early; its stderr explains why
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = proc.wait()
+            sub_writer.join()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode('utf-8', errors='replace')
+    
+    return returncode == 0, stderr
+
+
+# JSON-encoded transcriptions already read or written by this process, keyed
+# by cache key. The raw bytes are kept so every caller parses its own copy
+# and can shift segment timings in place without corrupting the memo.
+_TRANSCRIPTION_MEMO = {}
+
+
+def _audio_cache_key(path, sample_size=65536):
+    """Content-based cache key: hash of the first and last 64 KB plus the file size"""
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        h.update(f.read(sample_size))
+        f.seek(max(size - sample_size, 0))
+        h.update(f.read(sample_size))
+    h.update(str(size).encode())
+    return h.hexdigest()
+
+
+def _load_transcription_cache(cache_dir, cache_key):
+    """Return the cached Whisper result for cache_key, or None on a miss"""
+    payload = _TRANSCRIPTION_MEMO.get(cache_key)
+    if payload is None:
+        try:
+            with open(os.path.join(cache_dir, f"{cache_key}.json"), 'rb') as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+    try:
+        result = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    except Exception as e:
+        # A corrupt entry is treated as a miss and overwritten by the next save
+        print(f"⚠️ Ignoring unreadable transcription cache {cache_key}: {e}")
+        return None
+    _TRANSCRIPTION_MEMO[cache_key] = payload
+    return result
+
+
+def _save_transcription_cache(cache_dir, cache_key, result):
+    """Persist a Whisper result as JSON (orjson when installed) and memoize it in-process"""
+    payload = orjson.dumps(result) if ORJSON_AVAILABLE else json.dumps(result).encode('utf-8')
+    cache_file = os.path.join(cache_dir, f"{cache_key}.json")
+    # Write to a private temp file and rename it into place, so a concurrent
+    # run or a killed process never leaves a torn cache entry behind
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_file, cache_file)
+    _TRANSCRIPTION_MEMO[cache_key] = payload
+
+
+def _close_ffmpeg_subtitle_clips(video_clips, processed_clips, video_clip, audio, voiceover):
+    """Release the MoviePy readers opened by create_video_with_ffmpeg_subtitles"""
+    for clip in video_clips:
+        clip.close()
+    for clip in processed_clips:
+        clip.close()
+    video_clip.close()
+    audio.close()
+    if audio is not voiceover:
+        voiceover.close()
 
 
 def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=None, cta_path=None, bgm_volume=0.6, cta_volume=1.5):
     """
     FFMPEG-based ultra-fast subtitle generation.
     Uses FFmpeg subtitle filter instead of MoviePy TextClip for 10x speed improvement.
+    The clips are encoded exactly once: frames are piped into the FFmpeg
+    process that burns in the subtitles.
     """
-    import subprocess
-    import json
-    import tempfile
-    
+    executor = None
+    enhanced_ass_future = None
     try:
         print("🚀 Creating video with FFmpeg-based ULTRA FAST subtitles...")
         
@@ -1219,13 +1508,22 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
             raise Exception("MoviePy not available")
         
         from moviepy.editor import concatenate_videoclips
-        from whisper_service import transcribe_with_whisper
+        from moviepy.video.fx.loop import loop
+        from whisper_service import transcribe_batch
+        from enhanced_subtitle_service import build_enhanced_ass_content
         
         # Load voiceover to get duration
         voiceover = safe_load_audio(voiceover_path)
         voiceover_duration = voiceover.duration
         print(f"🎤 Voiceover duration: {voiceover_duration:.2f}s")
         
+        # Pause-aware subtitles only need the audio, so transcribe them in the
+        # background while clips are loaded and the audio is mixed
+        executor = ThreadPoolExecutor(max_workers=1)
+        enhanced_ass_future = executor.submit(
+            build_enhanced_ass_content, voiceover_path, cta_path, voiceover_duration
+        )
+        
         # Get random clips at LOWER RESOLUTION for speed
         print(f"🎞️ Getting random clips from {CLIPS_FOLDER}...")
         video_clips = get_random_clips(CLIPS_FOLDER, CLIP_DURATION, voiceover_duration)
@@ -1285,64 +1583,37 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
         # Extend video to match audio duration if needed
         if video_clip.duration < final_duration:
             print(f"🔄 Extending video to match audio duration ({final_duration:.2f}s)")
-            loops_needed = int(final_duration / video_clip.duration) + 1
-            video_clips_extended = [video_clip] * loops_needed
-            video_clip = concatenate_videoclips(video_clips_extended).subclip(0, final_duration)
+            # Lazy loop over the single source reader instead of concatenating copies
+            video_clip = loop(video_clip, duration=final_duration)
         elif video_clip.duration > final_duration:
             video_clip = video_clip.subclip(0, final_duration)
         
-        # Create intermediate video without subtitles first
-        temp_video_path = tempfile.mktemp(suffix='.mp4')
-        print("🎬 Creating intermediate video without subtitles...")
-        
-        video_with_audio = video_clip.set_audio(audio)
-        video_with_audio.write_videofile(
-            temp_video_path,
-            fps=24,
-            codec='libx264',
-            audio_codec='aac',
-            preset='fast',
-            verbose=False,
-            logger=None
-        )
+        # Frames are streamed straight into the subtitle-burning FFmpeg process
+        # below, so the (normalized) audio file is muxed in by path
+        final_audio_path = audio.filename
         
         # ENHANCED: Generate pause-aware subtitles that respect natural speech patterns
         print("📝 Generating PAUSE-AWARE subtitles that respect natural speech timing...")
         
         # Try enhanced pause-aware subtitles first
         try:
-            from enhanced_subtitle_service import create_enhanced_ass_subtitles_with_pauses
-            
             print("🎯 Using ENHANCED pause-aware subtitle system...")
-            ass_file_path = create_enhanced_ass_subtitles_with_pauses(voiceover_path, cta_path)
+            enhanced_ass_text = enhanced_ass_future.result()
             
-            if ass_file_path and os.path.exists(ass_file_path):
+            if enhanced_ass_text:
                 print("✅ Enhanced pause-aware subtitles created successfully!")
                 
-                # Apply enhanced ASS subtitles with FFmpeg
-                final_output_path = temp_video_path.replace('.mp4', '_with_enhanced_subs.mp4')
-                
-                ffmpeg_cmd = [
-                    'ffmpeg', '-y',
-                    '-i', temp_video_path,
-                    '-vf', f"ass={ass_file_path}",
-                    '-c:a', 'copy',
-                    '-c:v', 'libx264',
-                    '-preset', 'fast',
-                    final_output_path
-                ]
+                print("🎬 Encoding video with enhanced pause-aware subtitles in a single FFmpeg pass...")
+                success, stderr = burn_subtitles_from_frames(
+                    video_clip, final_audio_path, enhanced_ass_text, output_path, preset='fast'
+                )
                 
-                print("🎬 Adding enhanced pause-aware subtitles with FFmpeg...")
-                result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0:
+                if success:
                     print("✅ Enhanced pause-aware subtitles applied successfully!")
-                    # Move to final output
-                    import shutil
-                    shutil.move(final_output_path, output_path)
+                    _close_ffmpeg_subtitle_clips(video_clips, processed_clips, video_clip, audio, voiceover)
                     return output_path
                 else:
-                    print(f"⚠️  Enhanced subtitle processing failed: {result.stderr}")
+                    print(f"⚠️  Enhanced subtitle processing failed: {stderr}")
                     print("🔄 Falling back to standard subtitles...")
             
         except Exception as e:
@@ -1357,37 +1628,62 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
         cache_dir = "transcription_cache"
         os.makedirs(cache_dir, exist_ok=True)
         
-        # Cache key based on file modification time
-        voiceover_mtime = os.path.getmtime(voiceover_path)
-        cache_key = f"{os.path.basename(voiceover_path)}_{voiceover_mtime}"
-        cache_file = os.path.join(cache_dir, f"{cache_key}.json")
-        
-        if os.path.exists(cache_file):
-            print("⚡ Using cached voiceover transcription...")
-            with open(cache_file, 'r') as f:
-                voiceover_result = json.load(f)
-        else:
-            print("🤖 Transcribing voiceover with large-v3-turbo model for precise timing...")
-            voiceover_result = transcribe_with_whisper(voiceover_path)
-            # Cache the result
-            with open(cache_file, 'w') as f:
-                json.dump(voiceover_result, f)
+        # Cache key based on file content, so touched or copied audio still hits
+        cache_key = _audio_cache_key(voiceover_path)
+        voiceover_result = _load_transcription_cache(cache_dir, cache_key)
+        
+        needs_cta = bool(cta_path and timing_info['cta_duration'] > 0)
+        cta_cache_key = _audio_cache_key(cta_path) if needs_cta else None
+        cta_result = _load_transcription_cache(cache_dir, cta_cache_key) if needs_cta else None
+        
+        vo_missing = voiceover_result is None
+        cta_missing = needs_cta and cta_result is None
+        if vo_missing or cta_missing:
+            # Transcribe every cache miss in one batch on the shared model
+            print("🤖 Transcribing with large-v3-turbo model for precise timing...")
+            fresh_vo, fresh_cta = transcribe_batch(
+                [voiceover_path if vo_missing else None, cta_path if cta_missing else None],
+                batch_size=WHISPER_BATCH_SIZE,
+                vad=[True, False]  # The CTA is a short, tightly trimmed clip
+            )
+            # Cache each result under its own key
+            if vo_missing:
+                voiceover_result = fresh_vo
+                _save_transcription_cache(cache_dir, cache_key, voiceover_result)
+            if cta_missing:
+                cta_result = fresh_cta
+                _save_transcription_cache(cache_dir, cta_cache_key, cta_result)
             print("💾 Transcription cached for future use")
+        if not vo_missing:
+            print("⚡ Using cached voiceover transcription...")
         
         voiceover_segments = voiceover_result['segments'] if voiceover_result and 'segments' in voiceover_result else []
         
         # OPTIMIZATION: Split segments into 2-3 word chunks
         def split_into_word_chunks(segments, max_words=3):
-            """Split segments into smaller chunks of 2-3 words each"""
+            """Split segments into smaller chunks of 2-3 words each, uppercased for display"""
             chunked_segments = []
             
             for segment in segments:
+                words = segment.get('words')
+                if words:
+                    # Use Whisper's real word timestamps
+                    for i in range(0, len(words), max_words):
+                        group = words[i:i + max_words]
+                        chunked_segments.append({
+                            'text': ' '.join(w['word'] for w in group).upper(),
+                            'start': group[0]['start'],
+                            'end': group[-1]['end']
+                        })
+                    continue
+                
+                # No word timestamps (A4F API): interpolate evenly across the segment
                 text = segment['text'].strip()
                 words = text.split()
                 
                 if len(words) <= max_words:
                     # Keep as is if already small enough
-                    chunked_segments.append(segment)
+                    chunked_segments.append({**segment, 'text': text.upper()})
                 else:
                     # Split into chunks
                     start_time = segment['start']
@@ -1399,7 +1695,7 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
                     
                     for i in range(0, len(words), max_words):
                         chunk_words = words[i:i + max_words]
-                        chunk_text = ' '.join(chunk_words)
+                        chunk_text = ' '.join(chunk_words).upper()
                         
                         # Calculate timing for this chunk
                         chunk_start = start_time + (i * time_per_word)
@@ -1422,169 +1718,57 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
         
         # Generate CTA transcription if needed
         cta_segments = []
-        if cta_path and timing_info['cta_duration'] > 0:
+        if needs_cta:
             print("📝 Generating CTA subtitles...")
-            cta_mtime = os.path.getmtime(cta_path)
-            cta_cache_key = f"{os.path.basename(cta_path)}_{cta_mtime}"
-            cta_cache_file = os.path.join(cache_dir, f"{cta_cache_key}.json")
-            
-            if os.path.exists(cta_cache_file):
-                print("⚡ Using cached CTA transcription...")
-                with open(cta_cache_file, 'r') as f:
-                    cta_result = json.load(f)
-            else:
-                print("🤖 Transcribing CTA with large-v3-turbo model for precise timing...")
-                cta_result = transcribe_with_whisper(cta_path)
-                with open(cta_cache_file, 'w') as f:
-                    json.dump(cta_result, f)
-                print("💾 CTA transcription cached")
-            
             cta_segments = cta_result['segments'] if cta_result and 'segments' in cta_result else []
             if cta_segments:
-                # Adjust CTA timings first
-                for segment in cta_segments:
-                    segment['start'] += timing_info['cta_start']
-                    segment['end'] += timing_info['cta_start']
-                
-                # Apply word chunking to CTA segments as well
+                # Apply word chunking to CTA segments as well (on the CTA's own
+                # timeline, since word timestamps are relative to the CTA audio)
                 original_cta_count = len(cta_segments)
                 cta_segments = split_into_word_chunks(cta_segments, max_words=3)
                 print(f"🔧 Split CTA into word chunks: {original_cta_count} → {len(cta_segments)} segments (2-3 words each)")
-                print(f"✅ Adjusted {len(cta_segments)} CTA segments")
-        
-        # Create SRT subtitle file for FFmpeg
-        srt_file = tempfile.mktemp(suffix='.srt')
-        print("📝 Creating SRT subtitle file...")
-        
-        with open(srt_file, 'w', encoding='utf-8') as f:
-            subtitle_index = 1
-            
-            # Add voiceover subtitles
-            for segment in voiceover_segments:
-                text = segment['text'].strip()
-                if not text:
-                    continue
-                
-                start_time = segment['start']
-                end_time = segment['end']
-                
-                # Convert to SRT time format
-                start_srt = f"{int(start_time//3600):02d}:{int((start_time%3600)//60):02d}:{int(start_time%60):02d},{int((start_time%1)*1000):03d}"
-                end_srt = f"{int(end_time//3600):02d}:{int((end_time%3600)//60):02d}:{int(end_time%60):02d},{int((end_time%1)*1000):03d}"
-                
-                f.write(f"{subtitle_index}\n")
-                f.write(f"{start_srt} --> {end_srt}\n")
-                f.write(f"{text.upper()}\n\n")
-                subtitle_index += 1
-            
-            # Add CTA subtitles in yellow
-            for segment in cta_segments:
-                text = segment['text'].strip()
-                if not text:
-                    continue
-                
-                start_time = segment['start']
-                end_time = segment['end']
                 
-                start_srt = f"{int(start_time//3600):02d}:{int((start_time%3600)//60):02d}:{int(start_time%60):02d},{int((start_time%1)*1000):03d}"
-                end_srt = f"{int(end_time//3600):02d}:{int((end_time%3600)//60):02d}:{int(end_time%60):02d},{int((end_time%1)*1000):03d}"
-                
-                f.write(f"{subtitle_index}\n")
-                f.write(f"{start_srt} --> {end_srt}\n")
-                f.write(f"<font color='yellow'>{text.upper()}</font>\n\n")
-                subtitle_index += 1
-        
-        print(f"✅ Created SRT file with {subtitle_index-1} subtitles")
+                # Then shift the chunks to start after the voiceover
+                for segment in cta_segments:
+                    segment['start'] += timing_info['cta_start']
+                    segment['end'] += timing_info['cta_start']
+                print(f"✅ Adjusted {len(cta_segments)} CTA segments")
         
-        # Use FFmpeg to add subtitles with ASS/SRT file for better performance
+        # Use FFmpeg to add subtitles with ASS file for better positioning control
         print("🎯 Adding PERFECTLY CENTERED subtitles with ASS format...")
         
-        # Create ASS subtitle file for better positioning control
-        ass_file = tempfile.mktemp(suffix='.ass')
+        ass_lines = [FFMPEG_ASS_HEADER]
         
-        with open(ass_file, 'w', encoding='utf-8') as f:
-            # ASS format header with large font and perfect centering
-            f.write("[Script Info]\n")
-            f.write("Title: Video Subtitles\n")
-            f.write("ScriptType: v4.00+\n\n")
-            
-            f.write("[V4+ Styles]\n")
-            f.write("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n")
-            # Style for voiceover - white text, small font (19px), TRUE CENTER (alignment=5 = middle center)
-            f.write("Style: Voiceover,Bangers,19,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,1,2,0,5,0,0,0,1\n")
-            # Style for CTA - yellow text, small font (19px), TRUE CENTER (alignment=5 = middle center)  
-            f.write("Style: CTA,Bangers,19,&H0000FFFF,&H000000FF,&H00000000,&H80000000,1,0,0,0,100,100,0,0,1,2,0,5,0,0,0,1\n\n")
-            
-            f.write("[Events]\n")
-            f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
-            
-            # Add voiceover subtitles
-            for segment in voiceover_segments:
-                text = segment['text'].strip()
-                if not text:
-                    continue
-                    
-                start_time = segment['start']
-                end_time = segment['end']
-                
-                # Convert to ASS time format (h:mm:ss.cc)
-                start_ass = f"{int(start_time//3600)}:{int((start_time%3600)//60):02d}:{start_time%60:05.2f}"
-                end_ass = f"{int(end_time//3600)}:{int((end_time%3600)//60):02d}:{end_time%60:05.2f}"
-                
-                f.write(f"Dialogue: 0,{start_ass},{end_ass},Voiceover,,0,0,0,,{text.upper()}\n")
-            
-            # Add CTA subtitles
-            for segment in cta_segments:
+        # Single pass over voiceover then CTA segments (already uppercased by
+        # split_into_word_chunks), joined once and piped straight to FFmpeg
+        dialogue = []
+        for style, segments in (("Voiceover", voiceover_segments), ("CTA", cta_segments)):
+            for segment in segments:
                 text = segment['text'].strip()
-                if not text:
-                    continue
-                    
-                start_time = segment['start']
-                end_time = segment['end']
-                
-                # Convert to ASS time format
-                start_ass = f"{int(start_time//3600)}:{int((start_time%3600)//60):02d}:{start_time%60:05.2f}"
-                end_ass = f"{int(end_time//3600)}:{int((end_time%3600)//60):02d}:{end_time%60:05.2f}"
-                
-                f.write(f"Dialogue: 0,{start_ass},{end_ass},CTA,,0,0,0,,{text.upper()}\n")
+                if text:
+                    dialogue.append((segment['start'], segment['end'], style, text))
+        subtitle_count = len(dialogue)
         
-        print(f"✅ Created ASS subtitle file with {len(voiceover_segments) + len(cta_segments)} subtitles")
+        # Convert all start/end times to ASS time format (h:mm:ss.cc) at once
+        ass_times = format_ass_timestamps([d[0] for d in dialogue] + [d[1] for d in dialogue])
+        start_times, end_times = ass_times[:subtitle_count], ass_times[subtitle_count:]
+        for (_, _, style, text), start_ass, end_ass in zip(dialogue, start_times, end_times):
+            ass_lines.append(f"Dialogue: 0,{start_ass},{end_ass},{style},,0,0,0,,{text}\n")
         
-        ffmpeg_cmd = [
-            'ffmpeg', '-y',
-            '-i', temp_video_path,
-            '-vf', f"ass={ass_file}",
-            '-c:a', 'copy',  # Copy audio without re-encoding
-            '-preset', 'ultrafast',
-            output_path
-        ]
+        print(f"✅ Created ASS subtitles with {subtitle_count} lines")
         
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+        success, stderr = burn_subtitles_from_frames(
+            video_clip, final_audio_path, ''.join(ass_lines), output_path, preset='ultrafast'
+        )
         
-        if result.returncode == 0:
+        if success:
             print(f"✅ FFmpeg subtitle processing completed successfully!")
         else:
-            print(f"❌ FFmpeg error: {result.stderr}")
-            raise Exception(f"FFmpeg failed: {result.stderr}")
+            print(f"❌ FFmpeg error: {stderr}")
+            raise Exception(f"FFmpeg failed: {stderr}")
         
         # Cleanup
-        for clip in video_clips:
-            clip.close()
-        for clip in processed_clips:
-            clip.close()
-        video_clip.close()
-        video_with_audio.close()
-        audio.close()
-        if bgm_path or cta_path:
-            voiceover.close()
-        
-        # Remove temporary files
-        try:
-            os.remove(temp_video_path)
-            os.remove(srt_file)
-            os.remove(ass_file)
-        except:
-            pass
+        _close_ffmpeg_subtitle_clips(video_clips, processed_clips, video_clip, audio, voiceover)
         
         print(f"🚀 Ultra-fast FFmpeg video with subtitles created: {output_path}")
         return output_path
@@ -1593,3 +1777,7 @@ def create_video_with_ffmpeg_subtitles(voiceover_path, output_path, bgm_path=Non
         print(f"❌ Error creating FFmpeg video with subtitles: {e}")
         traceback.print_exc()
         return None
+    
+    finally:
+        # Never leave the subtitle transcription running past this function
+        _drain_background_jobs(executor, enhanced_ass_future)
@@ -1,22 +1,83 @@
+import os
 import requests
 import json
+import threading
 import traceback
-from config import WHISPER_AVAILABLE, WhisperModel, A4F_API_KEY, A4F_API_URL, FORCE_LOCAL_WHISPER
-from audio_service import compress_audio
+from config import WHISPER_AVAILABLE, WhisperModel, BatchedInferencePipeline, A4F_API_KEY, A4F_API_URL, FORCE_LOCAL_WHISPER, WHISPER_MODEL_CACHE_DIR
+from audio_service import compress_audio, resample_for_whisper
 
 # Global variables for this module
 WHISPER_MODEL = None
 WHISPER_MODEL_NAME = "base"
+# Serializes model loading when transcriptions are submitted from worker threads
+_MODEL_LOCK = threading.Lock()
+# Batched pipeline wrapping WHISPER_MODEL, rebuilt whenever the model changes
+_BATCHED_PIPELINE = None
+_BATCHED_PIPELINE_MODEL = None
+# Compressed uploads for the A4F fallback, keyed by source identity and target size
+_COMPRESSED_AUDIO = {}
+
+
+def detect_whisper_device():
+    """Return the device Faster-Whisper should run on (cuda when a GPU is visible)"""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
+
+
+def _create_whisper_model(model_name):
+    """Instantiate a Faster-Whisper model on the best available device"""
+    device = detect_whisper_device()
+    # int8 weights with float16 activations on GPU, plain int8 on CPU
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    # Environment override, e.g. float16 to compare accuracy against the quantized default
+    env_compute_type = os.environ.get('WHISPER_COMPUTE_TYPE', compute_type)
+    if env_compute_type != compute_type:
+        print(f"🔧 Using environment override compute type: {env_compute_type}")
+        compute_type = env_compute_type
+    print(f"🖥️ Whisper device: {device} ({compute_type})")
+    model_kwargs = dict(device=device, compute_type=compute_type)
+    if device == "cpu":
+        # Let CTranslate2 use every core, and allow two concurrent transcriptions
+        model_kwargs.update(cpu_threads=os.cpu_count() or 0, num_workers=2)
+    
+    try:
+        from huggingface_hub.utils import LocalEntryNotFoundError
+    except ImportError:
+        LocalEntryNotFoundError = FileNotFoundError
+    
+    # Weights already on disk load without any network check: first from the
+    # persistent cache, then from the default Hugging Face cache (so weights
+    # fetched before WHISPER_MODEL_CACHE_DIR existed are not downloaded again).
+    # Only a missing snapshot moves on; any other load error propagates.
+    for download_root in (WHISPER_MODEL_CACHE_DIR, None):
+        try:
+            return WhisperModel(model_name, local_files_only=True, download_root=download_root, **model_kwargs)
+        except LocalEntryNotFoundError:
+            continue
+    
+    print(f"⬇️ {model_name} not cached yet, downloading to {WHISPER_MODEL_CACHE_DIR}...")
+    return WhisperModel(model_name, download_root=WHISPER_MODEL_CACHE_DIR, **model_kwargs)
+
 
 def load_whisper_model(model_name="base"):
     """Load Whisper model once and reuse for efficiency"""
-    global WHISPER_MODEL, WHISPER_MODEL_NAME
     if not WHISPER_AVAILABLE:
         return None
+    with _MODEL_LOCK:
+        return _load_whisper_model_locked(model_name)
+
+
+def _load_whisper_model_locked(model_name):
+    global WHISPER_MODEL, WHISPER_MODEL_NAME
     if WHISPER_MODEL is None or WHISPER_MODEL_NAME != model_name:
         print(f"🤖 Loading Faster-Whisper model: {model_name}")
         try:
-            WHISPER_MODEL = WhisperModel(model_name, device="cpu", compute_type="int8")
+            WHISPER_MODEL = _create_whisper_model(model_name)
             WHISPER_MODEL_NAME = model_name
             print(f"✅ Faster-Whisper {model_name} model loaded successfully")
             return WHISPER_MODEL
@@ -25,7 +86,7 @@ def load_whisper_model(model_name="base"):
             if model_name != "base":
                 print("🔄 Falling back to base model...")
                 try:
-                    WHISPER_MODEL = WhisperModel("base", device="cpu", compute_type="int8")
+                    WHISPER_MODEL = _create_whisper_model("base")
                     WHISPER_MODEL_NAME = "base"
                     return WHISPER_MODEL
                 except Exception as fallback_error:
@@ -35,8 +96,27 @@ def load_whisper_model(model_name="base"):
     return WHISPER_MODEL
 
 
-def transcribe_with_whisper(audio_path, model_name="base", language=None, task="transcribe"):
-    """Transcribe audio using OpenAI Whisper with real timestamps"""
+def _get_batched_pipeline(model):
+    """Return a BatchedInferencePipeline over model, or None if unsupported"""
+    global _BATCHED_PIPELINE, _BATCHED_PIPELINE_MODEL
+    if BatchedInferencePipeline is None:
+        return None
+    with _MODEL_LOCK:
+        if _BATCHED_PIPELINE is None or _BATCHED_PIPELINE_MODEL is not model:
+            _BATCHED_PIPELINE = BatchedInferencePipeline(model=model)
+            _BATCHED_PIPELINE_MODEL = model
+        return _BATCHED_PIPELINE
+
+
+def transcribe_with_whisper(audio_path, model_name="base", language=None, task="transcribe", batch_size=None, vad=True):
+    """
+    Transcribe audio using OpenAI Whisper with real timestamps.
+    
+    With batch_size set, the VAD-split chunks of the audio are encoded
+    batch_size at a time through Faster-Whisper's BatchedInferencePipeline.
+    vad=False skips Silero VAD for short, already-trimmed clips (e.g. the CTA);
+    such clips are transcribed unbatched.
+    """
     if not WHISPER_AVAILABLE:
         if FORCE_LOCAL_WHISPER:
             print("❌ Local Whisper forced but not available. Please install faster-whisper.")
@@ -67,46 +147,56 @@ def transcribe_with_whisper(audio_path, model_name="base", language=None, task="
         print(f"🌍 Language: {language or 'auto-detect'}")
         print(f"🎯 Task: {task}")
         
-        segments, info = model.transcribe(
-            audio_path,
-            language=language,
-            task=task,
-            word_timestamps=True,
-            vad_filter=True,  # Voice Activity Detection
-            vad_parameters=dict(min_silence_duration_ms=500)
-        )
+        pipeline = _get_batched_pipeline(model) if batch_size and vad else None
+        if pipeline is not None:
+            print(f"📦 Batched inference: {batch_size} chunks per pass")
+            segments, info = pipeline.transcribe(
+                audio_path,
+                language=language,
+                task=task,
+                batch_size=batch_size,
+                word_timestamps=True,
+                vad_filter=True,  # Voice Activity Detection
+                vad_parameters=dict(min_silence_duration_ms=500)
+            )
+        else:
+            segments, info = model.transcribe(
+                audio_path,
+                language=language,
+                task=task,
+                word_timestamps=True,
+                vad_filter=vad,  # Voice Activity Detection
+                vad_parameters=dict(min_silence_duration_ms=500) if vad else None
+            )
         
         print(f"✅ Faster-Whisper transcription completed!")
         print(f"🔤 Detected language: {info.language}")
         
-        segment_list = list(segments)
-        full_text = " ".join([segment.text for segment in segment_list])
+        # Consume the segment generator once, building the text and the
+        # timestamped segments together
+        text_parts = []
+        result_segments = []
+        for segment in segments:
+            text_parts.append(segment.text)
+            result_segments.append({
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text.strip(),
+                'words': [
+                    {'word': word.word.strip(), 'start': word.start, 'end': word.end}
+                    for word in (getattr(segment, 'words', None) or ())
+                ]
+            })
+        
+        full_text = " ".join(text_parts)
         print(f"📝 Text: {full_text[:100]}...")
         
         result = {
             'text': full_text,
             'language': info.language,
-            'segments': []
+            'segments': result_segments
         }
         
-        for segment in segment_list:
-            segment_dict = {
-                'start': segment.start,
-                'end': segment.end,
-                'text': segment.text.strip(),
-                'words': []
-            }
-            
-            if hasattr(segment, 'words') and segment.words:
-                for word in segment.words:
-                    segment_dict['words'].append({
-                        'word': word.word.strip(),
-                        'start': word.start,
-                        'end': word.end
-                    })
-            
-            result['segments'].append(segment_dict)
-        
         print(f"📊 Generated {len(result['segments'])} segments with timestamps")
         for i, segment in enumerate(result['segments'][:3]):
             start = segment.get('start', 0)
@@ -129,15 +219,73 @@ def transcribe_with_whisper(audio_path, model_name="base", language=None, task="
             return transcribe_audio_with_a4f(audio_path)
 
 
+def _transcribe_resampled(audio_path, model_name, language, task, batch_size, vad):
+    """Transcribe one file from a temporary 16 kHz mono copy"""
+    whisper_input = resample_for_whisper(audio_path) if WHISPER_AVAILABLE else audio_path
+    try:
+        return transcribe_with_whisper(whisper_input, model_name, language, task, batch_size, vad)
+    finally:
+        if whisper_input != audio_path:
+            os.remove(whisper_input)
+
+
+def transcribe_batch(audio_paths, model_name="base", language=None, task="transcribe", batch_size=None, vad=True):
+    """
+    Transcribe several audio files on one shared Whisper model.
+    
+    load_whisper_model keeps the model resident, so only the first file pays
+    for model initialization and later ones (typically the short CTA) reuse
+    it. Each file is first resampled to 16 kHz mono so Whisper skips its own
+    decode/resample. batch_size is passed through to transcribe_with_whisper;
+    vad is either one flag for every file or a list of flags aligned with
+    audio_paths. Falsy paths yield None, keeping the results aligned with
+    audio_paths.
+    
+    Without batched inference the files are independent, so they are
+    transcribed concurrently; CTranslate2 releases the GIL while decoding.
+    """
+    vad_flags = vad if isinstance(vad, (list, tuple)) else [vad] * len(audio_paths)
+    jobs = [
+        (i, audio_path, use_vad)
+        for i, (audio_path, use_vad) in enumerate(zip(audio_paths, vad_flags))
+        if audio_path
+    ]
+    results = [None] * len(audio_paths)
+    
+    if len(jobs) > 1 and (BatchedInferencePipeline is None or not batch_size):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                (i, executor.submit(_transcribe_resampled, audio_path, model_name, language, task, batch_size, use_vad))
+                for i, audio_path, use_vad in jobs
+            ]
+            for i, future in futures:
+                results[i] = future.result()
+        return results
+    
+    for i, audio_path, use_vad in jobs:
+        results[i] = _transcribe_resampled(audio_path, model_name, language, task, batch_size, use_vad)
+    return results
+
+
 def transcribe_audio_with_a4f(audio_path, max_file_size_mb=0.5):
     """Transcribe audio using A4F API (fallback method)"""
     try:
         # Check file size and compress if needed
         import os
-        size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        st = os.stat(audio_path)
+        size_mb = st.st_size / (1024 * 1024)
         if size_mb > max_file_size_mb:
-            print(f"📉 Compressing audio: {size_mb:.2f}MB -> target: {max_file_size_mb}MB")
-            audio_path = compress_audio(audio_path, max_file_size_mb)
+            compress_key = (os.path.abspath(audio_path), st.st_mtime_ns, st.st_size, max_file_size_mb)
+            compressed_path = _COMPRESSED_AUDIO.get(compress_key)
+            if compressed_path and os.path.exists(compressed_path):
+                print(f"⚡ Reusing compressed audio: {compressed_path}")
+            else:
+                print(f"📉 Compressing audio: {size_mb:.2f}MB -> target: {max_file_size_mb}MB")
+                compressed_path = compress_audio(audio_path, max_file_size_mb)
+                if compressed_path != audio_path:
+                    _COMPRESSED_AUDIO[compress_key] = compressed_path
+            audio_path = compressed_path
         
         print(f"📤 Uploading to A4F API: {audio_path}")
         with open(audio_path, 'rb') as f:
@@ -6,14 +6,203 @@ Provides frame-accurate subtitle synchronization for every word
 
 import os
 import json
+import logging
+import multiprocessing
+import sqlite3
 import tempfile
-import shutil
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Any
 from captacity import add_captions
-from whisper_service import transcribe_with_whisper
-from config import CUSTOM_FONT_PATH, SUBTITLE_FONT_SIZE
+from whisper_service import transcribe_batch
+from config import CUSTOM_FONT_PATH, SUBTITLE_FONT_SIZE, WHISPER_BATCH_SIZE, ORJSON_AVAILABLE, orjson, TRANSCRIPTION_CACHE_DIR, TRANSCRIPTION_STORE_PATH, CAPTION_SHARDING_ENABLED, CAPTION_SHARD_MAX_WORKERS
+from utils import probe_media_duration, probe_video_format, read_json_file, run_cmd
 
-def create_word_level_subtitles(voiceover_path: str, cta_path: str = None, timing_info: Dict = None) -> List[Dict]:
+# Progress goes through logging so batch runners can silence it (e.g. WARNING) at no formatting cost
+logger = logging.getLogger(__name__)
+
+# Audio durations keyed by (path, mtime_ns), so reruns in this process skip the probe
+_DURATION_CACHE = {}
+
+# Word-level transcriptions for every audio file live in one SQLite database
+_TRANSCRIPTION_STORE = None
+_TRANSCRIPTION_STORE_LOCK = threading.Lock()
+
+# Short caption groups repeat often (e.g. "THE", "AND THE"), so uppercase each distinct text once
+_upper = lru_cache(maxsize=4096)(str.upper)
+
+# When CAPTION_SHARDING_ENABLED, each parallel caption shard gets at least this many segments
+CAPTION_SHARD_MIN_SEGMENTS = 12
+
+class WordTimeline:
+    """
+    Word-level subtitle timing stored as parallel arrays (structure of arrays)
+    
+    Indexing or iterating yields the same per-word dicts the list form used to
+    hold, so dicts are only built where a caller actually needs one.
+    """
+    TYPES = ('voiceover', 'cta')
+    
+    def __init__(self, texts: List[str], starts: np.ndarray, ends: np.ndarray,
+                 confidences: np.ndarray, types: np.ndarray):
+        self.texts = texts
+        self.starts = starts
+        self.ends = ends
+        self.confidences = confidences
+        self.types = types  # int8 index into TYPES
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, i: int) -> Dict:
+        return {
+            'text': self.texts[i],
+            'start': float(self.starts[i]),
+            'end': float(self.ends[i]),
+            'type': self.TYPES[self.types[i]],
+            'confidence': float(self.confidences[i])
+        }
+
+def _probe_duration(path: str) -> float:
+    """Audio duration in seconds from a single ffprobe call, memoized per file version"""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    duration = _DURATION_CACHE.get(key)
+    if duration is None:
+        duration = probe_media_duration(path)
+        if duration is None:
+            # ffprobe could not read it: fall back to decoding with MoviePy
+            from video_service import safe_load_audio
+            audio = safe_load_audio(path)
+            duration = audio.duration
+            audio.close()
+        _DURATION_CACHE[key] = duration
+    return duration
+
+def _dump_json(result: Any) -> bytes:
+    """Serialize a transcription for the cache store (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(result)
+    return json.dumps(result).encode('utf-8')
+
+def _load_json(blob: bytes) -> Any:
+    """Parse a transcription blob from the cache store (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+def _transcription_store() -> sqlite3.Connection:
+    """Shared connection to the word-level transcription store, opened on first use"""
+    global _TRANSCRIPTION_STORE
+    with _TRANSCRIPTION_STORE_LOCK:
+        if _TRANSCRIPTION_STORE is None:
+            os.makedirs(os.path.dirname(TRANSCRIPTION_STORE_PATH) or '.', exist_ok=True)
+            connection = sqlite3.connect(TRANSCRIPTION_STORE_PATH, check_same_thread=False)
+            # WAL lets other processes read while one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS transcriptions (key TEXT PRIMARY KEY, result BLOB NOT NULL)"
+            )
+            connection.commit()
+            _TRANSCRIPTION_STORE = connection
+        return _TRANSCRIPTION_STORE
+
+def _store_get(cache_key: str) -> bytes:
+    """Cached transcription blob for cache_key, or None"""
+    connection = _transcription_store()
+    with _TRANSCRIPTION_STORE_LOCK:
+        row = connection.execute("SELECT result FROM transcriptions WHERE key = ?", (cache_key,)).fetchone()
+    return row[0] if row else None
+
+def _store_put(cache_key: str, blob: bytes) -> None:
+    """Insert or replace the cached transcription blob for cache_key"""
+    connection = _transcription_store()
+    with _TRANSCRIPTION_STORE_LOCK:
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO transcriptions (key, result) VALUES (?, ?)", (cache_key, blob))
+
+def _word_level_cache_key(audio_path: str, mtime_ns: int) -> str:
+    """Store key for one version of an audio file"""
+    return f"{Path(audio_path).name}_{mtime_ns}_wordlevel"
+
+@lru_cache(maxsize=8)
+def _get_word_level_transcription(audio_path: str, mtime_ns: int, mtime: float) -> Dict:
+    """
+    Cached word-level Whisper result for one version of an audio file
+    
+    Served from this in-process LRU, then the SQLite transcription store.
+    mtime_ns is part of the key so an edited file misses; mtime (the float
+    st_mtime of the same stat) only names legacy JSON cache files. Raises
+    KeyError on a miss (exceptions are not cached), leaving transcription to
+    the caller.
+    """
+    cache_key = _word_level_cache_key(audio_path, mtime_ns)
+    
+    blob = _store_get(cache_key)
+    if blob is not None:
+        logger.debug("⚡ Using cached word-level transcription for %s...", Path(audio_path).name)
+        return _load_json(blob)
+    
+    # Entries written by the old one-JSON-file-per-key cache (named after the
+    # float os.path.getmtime value) are imported once
+    legacy_cache_file = os.path.join(TRANSCRIPTION_CACHE_DIR, f"{Path(audio_path).name}_{mtime}_wordlevel.json")
+    if os.path.exists(legacy_cache_file):
+        logger.debug("⚡ Importing cached word-level transcription for %s...", Path(audio_path).name)
+        result = read_json_file(legacy_cache_file)
+        _store_put(cache_key, _dump_json(result))
+        return result
+    
+    raise KeyError(cache_key)
+
+def _word_level_transcriptions(audio_paths: List[str]) -> List[Dict]:
+    """
+    Word-level results aligned with audio_paths (None for falsy paths and failures)
+    
+    Each file is looked up in the cache on its own; all misses then go through
+    a single transcribe_batch call, which decides whether to batch them or run
+    them concurrently.
+    """
+    results = [None] * len(audio_paths)
+    misses = []
+    for i, audio_path in enumerate(audio_paths):
+        if not audio_path:
+            continue
+        # One stat per lookup; a hit in the LRU then needs no further filesystem access
+        audio_stat = Path(audio_path).stat()
+        mtime_ns = audio_stat.st_mtime_ns
+        try:
+            results[i] = _get_word_level_transcription(audio_path, mtime_ns, audio_stat.st_mtime)
+        except KeyError:
+            misses.append((i, audio_path, mtime_ns))
+    
+    if misses:
+        logger.info("🤖 Transcribing %d file(s) with word-level precision (batched)...", len(misses))
+        transcribed = transcribe_batch([audio_path for _, audio_path, _ in misses], batch_size=WHISPER_BATCH_SIZE)
+        for (i, audio_path, mtime_ns), result in zip(misses, transcribed):
+            if result is None:
+                logger.error("❌ Word-level transcription failed for %s", audio_path)
+                continue
+            _store_put(_word_level_cache_key(audio_path, mtime_ns), _dump_json(result))
+            logger.debug("💾 Word-level transcription cached")
+            results[i] = result
+    
+    return results
+
+def _result_words(result: Dict) -> List[Dict]:
+    """Non-empty word entries of a Whisper result, in transcript order"""
+    if not result or 'segments' not in result:
+        return []
+    return [
+        word_info
+        for segment in result['segments']
+        for word_info in (segment.get('words') or ())
+        if word_info.get('word', '').strip()
+    ]
+
+def create_word_level_subtitles(voiceover_path: str, cta_path: str = None, timing_info: Dict = None) -> WordTimeline:
     """
     Create word-level synchronized subtitles using Captacity
     
@@ -23,144 +212,244 @@ def create_word_level_subtitles(voiceover_path: str, cta_path: str = None, timin
         timing_info: Timing information for CTA placement
     
     Returns:
-        List of word-level subtitle segments with precise timing
+        WordTimeline of word-level subtitle segments with precise timing, sorted by start
     """
-    print("🎯 Creating WORD-LEVEL synchronized subtitles with Captacity...")
-    
-    # Transcription cache directory
-    cache_dir = "transcription_cache"
-    os.makedirs(cache_dir, exist_ok=True)
-    
-    # Get detailed word-level transcription for voiceover
-    word_segments = []
-    
-    # Voiceover word-level transcription
-    print("🎤 Generating word-level transcription for voiceover...")
-    voiceover_mtime = os.path.getmtime(voiceover_path)
-    cache_key = f"{os.path.basename(voiceover_path)}_{voiceover_mtime}_wordlevel"
-    cache_file = os.path.join(cache_dir, f"{cache_key}.json")
-    
-    if os.path.exists(cache_file):
-        print("⚡ Using cached word-level voiceover transcription...")
-        with open(cache_file, 'r') as f:
-            voiceover_result = json.load(f)
-    else:
-        print("🤖 Transcribing voiceover with word-level precision...")
-        voiceover_result = transcribe_with_whisper(voiceover_path)
-        with open(cache_file, 'w') as f:
-            json.dump(voiceover_result, f)
-        print("💾 Word-level transcription cached")
-    
-    # Extract word-level segments from voiceover
-    if voiceover_result and 'segments' in voiceover_result:
-        for segment in voiceover_result['segments']:
-            if 'words' in segment and segment['words']:
-                for word_info in segment['words']:
-                    if word_info.get('word', '').strip():
-                        word_segments.append({
-                            'text': word_info['word'].strip(),
-                            'start': word_info['start'],
-                            'end': word_info['end'],
-                            'type': 'voiceover',
-                            'confidence': word_info.get('probability', 1.0)
-                        })
+    logger.info("🎯 Creating WORD-LEVEL synchronized subtitles with Captacity...")
     
     # CTA word-level transcription if provided
-    if cta_path and timing_info:
-        print("📢 Generating word-level transcription for CTA...")
-        cta_mtime = os.path.getmtime(cta_path)
-        cta_cache_key = f"{os.path.basename(cta_path)}_{cta_mtime}_wordlevel"
-        cta_cache_file = os.path.join(cache_dir, f"{cta_cache_key}.json")
-        
-        if os.path.exists(cta_cache_file):
-            print("⚡ Using cached word-level CTA transcription...")
-            with open(cta_cache_file, 'r') as f:
-                cta_result = json.load(f)
-        else:
-            print("🤖 Transcribing CTA with word-level precision...")
-            cta_result = transcribe_with_whisper(cta_path)
-            with open(cta_cache_file, 'w') as f:
-                json.dump(cta_result, f)
-            print("💾 CTA word-level transcription cached")
-        
-        # Extract word-level segments from CTA and adjust timing
-        if cta_result and 'segments' in cta_result:
-            cta_start_time = timing_info.get('cta_start', 0)
-            for segment in cta_result['segments']:
-                if 'words' in segment and segment['words']:
-                    for word_info in segment['words']:
-                        if word_info.get('word', '').strip():
-                            word_segments.append({
-                                'text': word_info['word'].strip(),
-                                'start': word_info['start'] + cta_start_time,
-                                'end': word_info['end'] + cta_start_time,
-                                'type': 'cta',
-                                'confidence': word_info.get('probability', 1.0)
-                            })
-    
-    # Sort all word segments by start time
-    word_segments.sort(key=lambda x: x['start'])
-    
-    print(f"✅ Generated {len(word_segments)} word-level segments")
+    logger.debug("🎤 Generating word-level transcription for voiceover...")
+    transcribe_cta = bool(cta_path and timing_info)
+    if transcribe_cta:
+        logger.debug("📢 Generating word-level transcription for CTA...")
+    voiceover_result, cta_result = _word_level_transcriptions([voiceover_path, cta_path if transcribe_cta else None])
+    
+    # Gather the word entries of both transcripts (no per-word copies yet)
+    voiceover_words = _result_words(voiceover_result)
+    cta_words = _result_words(cta_result)
+    words = voiceover_words + cta_words
+    word_count = len(words)
+    
+    # Fill the parallel arrays in one pass each
+    starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=word_count)
+    ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=word_count)
+    confidences = np.fromiter((w.get('probability', 1.0) for w in words), dtype=np.float32, count=word_count)
+    types = np.zeros(word_count, dtype=np.int8)
+    
+    # CTA words: shift onto the video timeline after the voiceover
+    if cta_words:
+        cta_start_time = timing_info.get('cta_start', 0)
+        starts[len(voiceover_words):] += cta_start_time
+        ends[len(voiceover_words):] += cta_start_time
+        types[len(voiceover_words):] = WordTimeline.TYPES.index('cta')
+    
+    # Sort all word segments by start time (stable, in C)
+    order = np.argsort(starts, kind='stable')
+    texts = [words[i]['word'].strip() for i in order.tolist()]
+    word_segments = WordTimeline(texts, starts[order], ends[order], confidences[order], types[order])
+    
+    logger.debug("✅ Generated %d word-level segments", len(word_segments))
     
     return word_segments
 
-def group_words_for_display(word_segments: List[Dict], max_words: int = 2, max_duration: float = 2.0) -> List[Dict]:
+def group_words_for_display(word_segments: WordTimeline, max_words: int = 2, max_duration: float = 2.0) -> List[Dict]:
     """
     Group individual words into readable subtitle chunks while maintaining precise timing
     
     Args:
-        word_segments: List of individual word segments
+        word_segments: WordTimeline of individual word segments (sorted by start)
         max_words: Maximum words per subtitle (default: 2 for better mobile readability)
         max_duration: Maximum duration per subtitle in seconds
     
     Returns:
         List of grouped subtitle segments with embedded word timing
     """
-    print(f"🔧 Grouping words into {max_words}-word subtitles for optimal readability...")
+    logger.debug("🔧 Grouping words into %d-word subtitles for optimal readability...", max_words)
+    
+    word_count = len(word_segments)
+    if word_count == 0:
+        logger.debug("✅ Created 0 optimized subtitle groups")
+        return []
+    
+    # A type change always starts a new group; find those in one vector op
+    type_changes = np.flatnonzero(word_segments.types[1:] != word_segments.types[:-1]) + 1
+    run_bounds = np.concatenate(([0], type_changes, [word_count])).tolist()
+    
+    # Within a run, the word-count and duration limits depend on where the
+    # current group began, so walk plain floats (no dicts) to place the cuts
+    starts = word_segments.starts.tolist()
+    group_starts = []
+    for run_start, run_end in zip(run_bounds[:-1], run_bounds[1:]):
+        head = run_start
+        group_starts.append(head)
+        for i in range(run_start + 1, run_end):
+            if i - head >= max_words or starts[i] - starts[head] > max_duration:
+                head = i
+                group_starts.append(head)
+    
+    group_starts = np.array(group_starts)
+    group_ends = np.append(group_starts[1:], word_count)
+    mean_confidences = (
+        np.add.reduceat(word_segments.confidences.astype(np.float64), group_starts) / (group_ends - group_starts)
+    )
     
     grouped_segments = []
-    current_group = []
-    current_type = None
-    
-    for word in word_segments:
-        # Start new group if type changes or max words reached
-        if (current_type != word['type'] or 
-            len(current_group) >= max_words or
-            (current_group and word['start'] - current_group[0]['start'] > max_duration)):
+    for group_start, group_end, confidence in zip(group_starts.tolist(), group_ends.tolist(), mean_confidences.tolist()):
+        group_words = [word_segments[i] for i in range(group_start, group_end)]
+        # Create subtitle from the group with embedded word timing
+        grouped_segments.append({
+            'text': ' '.join(word_segments.texts[group_start:group_end]),
+            'start': group_words[0]['start'],
+            'end': group_words[-1]['end'],
+            'type': group_words[0]['type'],
+            'word_count': group_end - group_start,
+            'confidence': confidence,
+            'words': group_words  # Keep original word timing for Captacity
+        })
+    
+    logger.debug("✅ Created %d optimized subtitle groups", len(grouped_segments))
+    return grouped_segments
+
+def _add_captacity_captions(video_path: str, output_path: str, captacity_segments: List[Dict]) -> str:
+    """Burn captacity_segments into video_path with the project's caption style"""
+    # Determine font to use
+    font_path = CUSTOM_FONT_PATH if CUSTOM_FONT_PATH and os.path.exists(CUSTOM_FONT_PATH) else 'Arial'
+    font_size = SUBTITLE_FONT_SIZE if SUBTITLE_FONT_SIZE else 15
+    
+    add_captions(
+        video_file=video_path,
+        output_file=output_path,
+        font=font_path,  
+        font_size=font_size,  # Use configured font size
+        font_color='white',
+        stroke_width=2,
+        stroke_color='black',
+        highlight_current_word=False,
+        line_count=1,
+        padding=60,
+        position=('center', 'center'),
+        shadow_strength=0.8,
+        shadow_blur=0.1,
+        segments=captacity_segments,
+        use_local_whisper=False,
+        print_info=False  # Disable verbose output
+    )
+    return output_path
+
+def _shift_caption_segment(segment: Dict, offset: float) -> Dict:
+    """Copy of a Captacity segment with its own and its words' times moved by offset"""
+    return {
+        'start': segment['start'] + offset,
+        'end': segment['end'] + offset,
+        'text': segment['text'],
+        'words': [
+            {'word': word['word'], 'start': word['start'] + offset, 'end': word['end'] + offset}
+            for word in segment['words']
+        ]
+    }
+
+def _caption_shard(video_path: str, start: float, duration: float, frame_count: int,
+                   shard_segments: List[Dict], slice_path: str, output_path: str) -> str:
+    """Cut one frame-aligned window out of video_path and caption it (runs in a worker process)"""
+    # Re-encode the window: a stream copy can only cut on keyframes, which would
+    # shift the window and put the captions out of sync. Always libx264, since
+    # many shards at once would exceed the hardware encoders' session limits.
+    # start is frame-aligned and -frames:v takes an exact frame count, so the
+    # windows add up to the source frame for frame
+    slice_cmd = [
+        'ffmpeg', '-y',
+        '-ss', f"{start:.6f}", '-i', video_path,
+        '-frames:v', str(frame_count),
+        '-t', f"{duration:.6f}",
+        '-c:v', 'libx264', '-preset', 'ultrafast',
+        '-c:a', 'aac',
+        slice_path
+    ]
+    result = run_cmd(slice_cmd, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Could not cut caption shard at {start:.2f}s: {result.stderr[-500:]}")
+    
+    shifted_segments = [_shift_caption_segment(segment, -start) for segment in shard_segments]
+    return _add_captacity_captions(slice_path, output_path, shifted_segments)
+
+def _add_captions_in_shards(video_path: str, captacity_segments: List[Dict], output_path: str,
+                            shard_count: int) -> bool:
+    """
+    Caption video_path in shard_count time windows on separate processes
+    
+    Windows are cut on frame boundaries between subtitle segments, so no
+    caption straddles two shards. The captioned windows are joined with the
+    concat demuxer and the source's own audio is muxed back in, so shard
+    boundaries never touch the audio track; their summed duration is checked
+    against the source first so the video cannot drift from that audio.
+    Returns False (leaving output_path untouched) on any failure.
+    """
+    video_duration, video_format = probe_video_format(video_path)
+    if not video_duration:
+        return False
+    try:
+        fps = Fraction(video_format[4])
+    except (TypeError, ValueError, ZeroDivisionError):
+        return False
+    if fps <= 0:
+        return False
+    
+    # Roughly equal numbers of segments per shard, each window starting on the
+    # frame nearest its first segment
+    shard_size = -(-len(captacity_segments) // shard_count)
+    shards = [captacity_segments[i:i + shard_size] for i in range(0, len(captacity_segments), shard_size)]
+    total_frames = round(video_duration * fps)
+    cut_frames = [0] + [round(shard[0]['start'] * fps) for shard in shards[1:]] + [total_frames]
+    if any(end <= start for start, end in zip(cut_frames[:-1], cut_frames[1:])):
+        return False
+    cut_times = [float(frame / fps) for frame in cut_frames]
+    
+    logger.info("⚡ Captioning %d shards in parallel...", len(shards))
+    try:
+        with tempfile.TemporaryDirectory(prefix='captions_') as temp_dir:
+            # spawn: forked workers would inherit the Whisper model, the SQLite
+            # connection and live threads of this process
+            with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [
+                    executor.submit(
+                        _caption_shard, video_path, cut_times[i], cut_times[i + 1] - cut_times[i],
+                        cut_frames[i + 1] - cut_frames[i], shard,
+                        os.path.join(temp_dir, f'slice_{i:03d}.mp4'),
+                        os.path.join(temp_dir, f'captioned_{i:03d}.mp4')
+                    )
+                    for i, shard in enumerate(shards)
+                ]
+                captioned_paths = [future.result() for future in futures]
             
-            if current_group:
-                # Create subtitle from current group with embedded word timing
-                subtitle = {
-                    'text': ' '.join([w['text'] for w in current_group]),
-                    'start': current_group[0]['start'],
-                    'end': current_group[-1]['end'],
-                    'type': current_type,
-                    'word_count': len(current_group),
-                    'confidence': sum([w['confidence'] for w in current_group]) / len(current_group),
-                    'words': current_group  # Keep original word timing for Captacity
-                }
-                grouped_segments.append(subtitle)
-                current_group = []
-        
-        current_group.append(word)
-        current_type = word['type']
-    
-    # Add final group
-    if current_group:
-        subtitle = {
-            'text': ' '.join([w['text'] for w in current_group]),
-            'start': current_group[0]['start'],
-            'end': current_group[-1]['end'],
-            'type': current_type,
-            'word_count': len(current_group),
-            'confidence': sum([w['confidence'] for w in current_group]) / len(current_group),
-            'words': current_group  # Keep original word timing for Captacity
-        }
-        grouped_segments.append(subtitle)
+            # Allow one frame of container rounding per shard, no more
+            shard_durations = [probe_media_duration(path) for path in captioned_paths]
+            if None in shard_durations or abs(sum(shard_durations) - cut_times[-1]) > len(shards) / fps:
+                logger.warning("⚠️  Caption shards do not add up to the source duration, captioning in one pass")
+                return False
+            
+            list_path = os.path.join(temp_dir, 'shards.txt')
+            with open(list_path, 'w', encoding='utf-8') as list_file:
+                for captioned_path in captioned_paths:
+                    escaped_path = captioned_path.replace("'", "'\\''")
+                    list_file.write(f"file '{escaped_path}'\n")
+            
+            concat_cmd = [
+                'ffmpeg', '-y',
+                '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-i', video_path,
+                '-map', '0:v:0',
+                '-map', '1:a:0?',
+                '-c', 'copy',
+                output_path
+            ]
+            result = run_cmd(concat_cmd, check=False)
+            if result.returncode != 0:
+                logger.warning("⚠️  Could not join caption shards: %s", result.stderr[-500:])
+                return False
+        return True
     
-    print(f"✅ Created {len(grouped_segments)} optimized subtitle groups")
-    return grouped_segments
+    except Exception as e:
+        logger.warning("⚠️  Sharded captioning failed, captioning in one pass: %s", e)
+        return False
 
 def create_enhanced_subtitle_video(video_path: str, subtitle_segments: List[Dict], output_path: str) -> str:
     """
@@ -174,84 +463,52 @@ def create_enhanced_subtitle_video(video_path: str, subtitle_segments: List[Dict
     Returns:
         Path to output video with subtitles
     """
-    print("🎬 Adding word-level synchronized subtitles with Captacity...")
+    logger.info("🎬 Adding word-level synchronized subtitles with Captacity...")
+    
+    # group_words_for_display always embeds a non-empty 'words' list per group
+    if not all(segment.get('words') for segment in subtitle_segments):
+        raise ValueError("subtitle segments need embedded word timing")
     
     # Create subtitle segments for Captacity with proper word-level format
     captacity_segments = []
     
     for segment in subtitle_segments:
-        subtitle_type = segment.get('type', 'voiceover')
-        
-        # Use the embedded word timing from our grouped segments
-        words_array = []
-        if 'words' in segment and segment['words']:
-            # Use the precise word timing from Whisper
-            for word_data in segment['words']:
-                words_array.append({
-                    'word': word_data['text'],
-                    'start': word_data['start'],
-                    'end': word_data['end']
-                })
-        else:
-            # Fallback: split text and estimate timing
-            words = segment['text'].split()
-            segment_duration = segment['end'] - segment['start']
-            word_duration = segment_duration / len(words) if words else 0
-            
-            current_time = segment['start']
-            for word in words:
-                word_end = current_time + word_duration
-                words_array.append({
-                    'word': word,
-                    'start': current_time,
-                    'end': word_end
-                })
-                current_time = word_end
+        # Use the precise word timing from Whisper, renaming 'text' to Captacity's 'word'
+        words_array = [
+            {'word': word_data['text'], 'start': word_data['start'], 'end': word_data['end']}
+            for word_data in segment['words']
+        ]
         
         captacity_segment = {
             'start': segment['start'],
             'end': segment['end'],
-            'text': segment['text'].upper(),
+            'text': _upper(segment['text']),
             'words': words_array  # Precise word timing for Captacity
         }
         captacity_segments.append(captacity_segment)
     
-    print(f"🎯 Processing {len(captacity_segments)} subtitle segments with Captacity...")
+    logger.debug("🎯 Processing %d subtitle segments with Captacity...", len(captacity_segments))
     
     try:
         # Use Captacity to add captions with correct parameters
-        print(f"🎥 Using Captacity with {len(captacity_segments)} segments...")
-        print(f"📝 Sample segment: {captacity_segments[0]['text'][:50]}...")
-        
-        # Determine font to use
-        font_path = CUSTOM_FONT_PATH if CUSTOM_FONT_PATH and os.path.exists(CUSTOM_FONT_PATH) else 'Arial'
-        font_size = SUBTITLE_FONT_SIZE if SUBTITLE_FONT_SIZE else 15
+        logger.debug("🎥 Using Captacity with %d segments...", len(captacity_segments))
+        logger.debug("📝 Sample segment: %.50s...", captacity_segments[0]['text'])
         
-        result_video = add_captions(
-            video_file=video_path,
-            output_file=output_path,
-            font=font_path,  
-            font_size=font_size,  # Use configured font size
-            font_color='white',
-            stroke_width=2,
-            stroke_color='black',
-            highlight_current_word=False,
-            line_count=1,
-            padding=60,
-            position=('center', 'center'),
-            shadow_strength=0.8,
-            shadow_blur=0.1,
-            segments=captacity_segments,
-            use_local_whisper=False,
-            print_info=False  # Disable verbose output
-        )
+        # Captacity renders on a single core; when enabled, long captions are
+        # split into time shards that are captioned in parallel worker processes
+        shard_count = 0
+        if CAPTION_SHARDING_ENABLED:
+            shard_count = min(CAPTION_SHARD_MAX_WORKERS, os.cpu_count() or 1,
+                              len(captacity_segments) // CAPTION_SHARD_MIN_SEGMENTS)
+        if shard_count < 2 or not _add_captions_in_shards(video_path, captacity_segments, output_path, shard_count):
+            _add_captacity_captions(video_path, output_path, captacity_segments)
         
-        print("✅ Captacity subtitle processing completed successfully!")
+        logger.info("✅ Captacity subtitle processing completed successfully!")
         return output_path
         
     except Exception as e:
-        print(f"❌ Captacity processing error: {e}")
-        print("🔄 Falling back to FFmpeg ASS subtitle method...")
+        logger.error("❌ Captacity processing error: %s", e)
+        logger.warning("🔄 Falling back to FFmpeg ASS subtitle method...")
         return None
 
 def create_comprehensive_word_sync_video(voiceover_path: str, output_path: str, 
@@ -270,102 +527,70 @@ def create_comprehensive_word_sync_video(voiceover_path: str, output_path: str,
     Returns:
         Path to final video with word-synchronized subtitles
     """
-    print("🚀 Creating comprehensive word-synchronized video...")
+    logger.info("🚀 Creating comprehensive word-synchronized video...")
     
     # Import required video service functions
-    from video_service import create_video_with_ffmpeg_subtitles, safe_load_audio
+    from video_service import create_video_with_ffmpeg_subtitles, create_video_with_random_clips_fixed
     
-    # First create a standard video with ASS subtitles as a baseline
-    print("🎬 Creating baseline video with standard subtitles...")
-    standard_video_path = tempfile.mktemp(suffix='_standard.mp4')
+    # Intermediates live in a private temp directory that is removed on every exit path
+    with tempfile.TemporaryDirectory(prefix='wordsync_') as temp_dir:
+        try:
+            # Captacity draws the captions itself, so it only needs the clips and
+            # mixed audio: no subtitle burn-in pass is spent on its input
+            logger.info("🎬 Creating base video without subtitles for Captacity...")
+            no_subs_path = create_video_with_random_clips_fixed(
+                voiceover_path=voiceover_path,
+                output_path=os.path.join(temp_dir, 'no_subs.mp4'),
+                bgm_path=bgm_path,
+                cta_path=cta_path
+            )
+            
+            if no_subs_path:
+                logger.debug("✅ Base video created, now adding word-level subtitles...")
+                
+                # Get timing information for CTA
+                timing_info = {}
+                if cta_path:
+                    timing_info['cta_start'] = _probe_duration(voiceover_path)
+                    timing_info['cta_duration'] = _probe_duration(cta_path)
+                
+                # Create word-level subtitles
+                word_segments = create_word_level_subtitles(voiceover_path, cta_path, timing_info)
+                
+                # Group words for optimal display
+                subtitle_segments = group_words_for_display(word_segments, max_words=2)
+                
+                logger.debug("🎯 Attempting to enhance with Captacity word-level subtitles...")
+                final_video_path = create_enhanced_subtitle_video(
+                    video_path=no_subs_path,
+                    subtitle_segments=subtitle_segments,
+                    output_path=output_path
+                )
+                
+                if final_video_path:
+                    logger.info("🎉 Comprehensive word-synchronized video created successfully!")
+                    return final_video_path
+                logger.warning("⚠️  Captacity enhancement failed")
+            else:
+                logger.warning("⚠️  Base video creation failed")
+        
+        except Exception as e:
+            logger.warning("⚠️  Word synchronization enhancement failed: %s", e)
     
+    # Fallback: render the standard ASS-subtitled video straight to the output
+    logger.warning("🔄 Falling back to video with standard subtitles...")
     base_video_path = create_video_with_ffmpeg_subtitles(
         voiceover_path=voiceover_path,
-        output_path=standard_video_path,
+        output_path=output_path,
         bgm_path=bgm_path,
         cta_path=cta_path
     )
     
     if not base_video_path:
-        print("❌ Base video creation failed")
+        logger.error("❌ Base video creation failed")
         return None
     
-    print("✅ Baseline video created, now enhancing with word-level subtitles...")
-    
-    # Get timing information for CTA
-    timing_info = {}
-    if cta_path:
-        voiceover_audio = safe_load_audio(voiceover_path)
-        timing_info['cta_start'] = voiceover_audio.duration
-        cta_audio = safe_load_audio(cta_path)
-        timing_info['cta_duration'] = cta_audio.duration
-        voiceover_audio.close()
-        cta_audio.close()
-    
-    # Create word-level subtitles
-    word_segments = create_word_level_subtitles(voiceover_path, cta_path, timing_info)
-    
-    # Group words for optimal display
-    subtitle_segments = group_words_for_display(word_segments, max_words=2)
-    
-    # Try to add enhanced subtitles with Captacity
-    print("🎯 Attempting to enhance with Captacity word-level subtitles...")
-    try:
-        # Create a temporary video without the ASS subtitles for Captacity processing
-        temp_no_subs_path = tempfile.mktemp(suffix='_no_subs.mp4')
-        
-        # Extract video without subtitles using FFmpeg
-        import subprocess
-        cmd = [
-            'ffmpeg', '-y', '-i', base_video_path,
-            '-c:v', 'copy', '-c:a', 'copy',
-            '-an', temp_no_subs_path  # Copy without audio to isolate video
-        ]
-        
-        print("🔧 Extracting video track for Captacity processing...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print("⚠️  Could not extract video track, using original video")
-            temp_no_subs_path = base_video_path
-        
-        # Add subtitles with Captacity
-        final_video_path = create_enhanced_subtitle_video(
-            video_path=temp_no_subs_path,
-            subtitle_segments=subtitle_segments,
-            output_path=output_path
-        )
-        
-        # Cleanup intermediate files
-        for temp_file in [standard_video_path, temp_no_subs_path]:
-            try:
-                if temp_file != base_video_path and os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except:
-                pass
-        
-        if final_video_path:
-            print("🎉 Comprehensive word-synchronized video created successfully!")
-            return final_video_path
-        else:
-            print("⚠️  Captacity enhancement failed, returning baseline video")
-            return base_video_path
-    
-    except Exception as e:
-        print(f"⚠️  Word synchronization enhancement failed: {e}")
-        print("🔄 Returning baseline video with standard subtitles")
-        
-        # Copy baseline to final output
-        import shutil
-        shutil.copy2(base_video_path, output_path)
-        
-        # Cleanup
-        try:
-            os.remove(base_video_path)
-        except:
-            pass
-        
-        return output_path
+    return base_video_path
 
 if __name__ == "__main__":
     print("🎯 Enhanced Word-by-Word Synchronization Module")